@@ -1,16 +1,33 @@
 # 서버 실행 명령어
-# python -m uvicorn server:app --host 127.0.0.1 --port 8000 --reload
+# python server.py   (uvloop/httptools가 설치되어 있으면 자동 사용)
+# 부하 테스트용 다중 워커: python server.py --workers 4
+#   주의: STATE/토큰 캐시는 워커(프로세스)별로 따로 존재하므로
+#   /admin/toggle_overload 결과가 다른 워커에는 반영되지 않음
+# 개발 중 자동 재시작이 필요하면: python -m uvicorn server:app --host 127.0.0.1 --port 8000 --reload
 
 # server.py
 from fastapi import FastAPI, HTTPException, Query, Depends, status
 from fastapi.security import OAuth2PasswordBearer
+from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+import asyncio
+import hashlib
+import os
+import secrets
+import sys
+import threading
 import time
 import random
 from jose import jwt, JWTError
 
-app = FastAPI(title="Reliability & Auth Test Server", version="2.0.0")
+# 스크립트/--app-dir로 실행돼도 공용 모듈(src.core)을 찾을 수 있게 저장소 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.server_common import DefaultResponse, uvicorn_options
+
+app = FastAPI(title="Reliability & Auth Test Server", version="2.0.0",
+              default_response_class=DefaultResponse)
 
 # --- JWT 설정 ---
 # 실제 환경에서는 환경 변수로 관리해야 합니다.
@@ -20,12 +37,41 @@ ALGORITHM = "HS256"
 # 토큰을 가져올 의존성 객체
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/login")
 
+# --- JWT 검증 결과 캐시 ---
+# 같은 토큰이 반복 사용되므로 서명 검증/디코드 결과(role)를 짧게 캐싱
+TOKEN_CACHE_TTL_S = 30.0
+TOKEN_CACHE_MAXSIZE = 10_000
+_TOKEN_CACHE: Dict[bytes, Tuple[str, float]] = {}  # digest -> (role, expires_at)
+_TOKEN_CACHE_LOCK = threading.Lock()
+
 # --- 서버 상태 (신뢰성 테스트용) ---
-STATE: Dict[str, float | bool] = {
-    "overloaded": False,
-    "failure_rate": 0.0,
-    "extra_latency_ms": 0.0,
-}
+@dataclass(frozen=True, slots=True)
+class ChaosState:
+    overloaded: bool = False
+    failure_rate: float = 0.0
+    extra_latency_ms: float = 0.0
+    # 요청마다 다시 계산하지 않도록 토글 시점에 미리 계산해 두는 값
+    effective_failure_rate: float = field(init=False, default=0.0)
+    extra_latency_s: float = field(init=False, default=0.0)
+
+    def __post_init__(self):
+        eff = max(0.2, self.failure_rate) if self.overloaded else 0.0
+        object.__setattr__(self, "effective_failure_rate", eff)
+        object.__setattr__(self, "extra_latency_s", self.extra_latency_ms / 1000.0)
+
+    def as_dict(self) -> Dict[str, float | bool]:
+        return {
+            "overloaded": self.overloaded,
+            "failure_rate": self.failure_rate,
+            "extra_latency_ms": self.extra_latency_ms,
+        }
+
+# 불변 스냅샷. 관리자 API는 새 객체로 통째로 교체(참조 교체는 원자적)
+STATE = ChaosState()
+
+# 실패 주입 전용 난수기. 핸들러는 모두 이벤트 루프 한 스레드에서 돌기 때문에
+# 스레드별 인스턴스 없이 바운드 메서드 하나를 재사용
+_chaos_random = random.Random().random
 
 # --- 데이터 모델 ---
 class LoginReq(BaseModel):
@@ -45,13 +91,13 @@ def get_user(username: str):
         return {"username": "user", "role": "user"}
     return None
 
-def apply_chaos():
+async def apply_chaos():
     """혼란 주입 (지연, 실패)"""
-    extra = float(STATE["extra_latency_ms"])
-    if extra > 0:
-        time.sleep(extra / 1000.0)
+    state = STATE
+    if state.extra_latency_s > 0:
+        await asyncio.sleep(state.extra_latency_s)
     
-    if STATE["overloaded"] and random.random() < max(0.2, float(STATE["failure_rate"])):
+    if state.overloaded and _chaos_random() < state.effective_failure_rate:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="temporary overload")
 
 def create_jwt_token(data: dict):
@@ -59,58 +105,98 @@ def create_jwt_token(data: dict):
     to_encode = data.copy()
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_current_user_role(token: str = Depends(oauth2_scheme)):
+# 더미 사용자가 고정(admin/user)이고 exp 클레임도 없으므로 토큰을 시작 시 한 번만 발급
+DUMMY_PASSWORD = b"pass"
+ISSUED_TOKENS: Dict[str, str] = {
+    name: create_jwt_token({"sub": name, "role": get_user(name)["role"]})
+    for name in ("admin", "user")
+}
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+def _cache_get_role(key: bytes):
+    now = time.monotonic()
+    with _TOKEN_CACHE_LOCK:
+        hit = _TOKEN_CACHE.get(key)
+        if hit is None:
+            return None
+        role, expires_at = hit
+        if now >= expires_at:
+            _TOKEN_CACHE.pop(key, None)
+            return None
+        return role
+
+def _cache_put_role(key: bytes, role: str, exp=None):
+    """검증 성공한 토큰만 저장. exp 클레임이 있으면 TTL보다 먼저 만료시킴"""
+    expires_at = time.monotonic() + TOKEN_CACHE_TTL_S
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, time.monotonic() + (exp - time.time()))
+    with _TOKEN_CACHE_LOCK:
+        if len(_TOKEN_CACHE) >= TOKEN_CACHE_MAXSIZE:
+            _TOKEN_CACHE.clear()
+        _TOKEN_CACHE[key] = (role, expires_at)
+
+async def get_current_user_role(token: str = Depends(oauth2_scheme)):
     """JWT 토큰을 검증하고 사용자 역할을 추출"""
+    key = _token_key(token)
+    role = _cache_get_role(key)
+    if role is not None:
+        return role
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         role: str = payload.get("role")
         if role is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+        # 디코드 실패/역할 누락은 캐싱하지 않음
+        _cache_put_role(key, role, payload.get("exp"))
         return role
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
 
-def get_admin_user(role: str = Depends(get_current_user_role)):
+async def get_admin_user(role: str = Depends(get_current_user_role)):
     """관리자 권한 확인"""
     if role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not an administrator")
     return role
 
 # --- 엔드포인트 ---
+# 헬스체크 응답 본문은 두 가지뿐이므로 미리 만들어 두고 직렬화 없이 그대로 반환
+HEALTH_OK = Response(content=b'{"status":"ok"}', media_type="application/json")
+HEALTH_DEGRADED = Response(content=b'{"status":"degraded"}', media_type="application/json")
+
 @app.get("/health")
-def health():
+async def health():
     """헬스체크"""
-    if STATE["overloaded"]:
-        time.sleep(0.3)
-        return {"status": "degraded"}
-    return {"status": "ok"}
+    if STATE.overloaded:
+        await asyncio.sleep(0.3)
+        return HEALTH_DEGRADED
+    return HEALTH_OK
 
 @app.post("/api/login", response_model=Token)
-def login(req: LoginReq):
+async def login(req: LoginReq):
     """
     로그인 API. 사용자 정보에 따라 JWT 토큰 발급.
     - `admin`: 관리자 권한 토큰
     - `user`: 일반 사용자 권한 토큰
     """
-    user = get_user(req.username)
-    if not user or req.password != "pass":
+    access_token = ISSUED_TOKENS.get(req.username)
+    password_ok = secrets.compare_digest(req.password.encode("utf-8"), DUMMY_PASSWORD)
+    if access_token is None or not password_ok:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     
-    token_data = {"sub": user["username"], "role": user["role"]}
-    access_token = create_jwt_token(token_data)
-    
     return {"access_token": access_token}
 
 @app.get("/api/echo")
-def echo(msg: str = "hello"):
+async def echo(msg: str = "hello"):
     """
     가벼운 에코 엔드포인트 (신뢰성 테스트용).
     """
-    apply_chaos()
+    await apply_chaos()
     return {"ok": True, "msg": msg}
 
 @app.get("/api/user_data")
-def user_data(role: str = Depends(get_current_user_role)):
+async def user_data(role: str = Depends(get_current_user_role)):
     """
     로그인한 사용자만 접근 가능한 엔드포인트.
     """
@@ -118,7 +204,7 @@ def user_data(role: str = Depends(get_current_user_role)):
 
 # -------- 관리자 전용 (권한 테스트 대상) --------
 @app.post("/admin/toggle_overload")
-def toggle_overload(
+async def toggle_overload(
     admin_role: str = Depends(get_admin_user),
     overloaded: bool = Query(...),
     failure_rate: float = Query(0.5, ge=0.0, le=1.0),
@@ -127,24 +213,45 @@ def toggle_overload(
     """
     과부하/지연/실패율 상태를 토글. **관리자만 접근 가능**.
     """
-    STATE["overloaded"] = overloaded
-    STATE["failure_rate"] = failure_rate
-    STATE["extra_latency_ms"] = float(extra_latency_ms)
-    return {"ok": True, **STATE}
+    global STATE
+    STATE = ChaosState(
+        overloaded=overloaded,
+        failure_rate=failure_rate,
+        extra_latency_ms=float(extra_latency_ms),
+    )
+    return {"ok": True, **STATE.as_dict()}
 
 @app.post("/admin/recover")
-def recover(admin_role: str = Depends(get_admin_user)):
+async def recover(admin_role: str = Depends(get_admin_user)):
     """
     정상 상태로 복구. **관리자만 접근 가능**.
     """
-    STATE["overloaded"] = False
-    STATE["failure_rate"] = 0.0
-    STATE["extra_latency_ms"] = 0.0
-    return {"ok": True, "msg": "recovered", **STATE}
+    global STATE
+    STATE = ChaosState()
+    return {"ok": True, "msg": "recovered", **STATE.as_dict()}
 
 @app.get("/")
-def root():
+async def root():
     return {
         "service": "Reliability & Auth Test Server",
-        "state": STATE,
-    }
\ No newline at end of file
+        "state": STATE.as_dict(),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--workers", type=int, default=1,
+                    help="워커 프로세스 수 (1보다 크면 관리자 상태 토글이 워커 간 공유되지 않음)")
+    args = ap.parse_args()
+
+    if args.workers > 1:
+        # 다중 워커는 import 문자열로 앱을 지정해야 함
+        uvicorn.run("server:app", host=args.host, port=args.port, workers=args.workers,
+                    app_dir=os.path.dirname(os.path.abspath(__file__)), **uvicorn_options())
+    else:
+        uvicorn.run(app, host=args.host, port=args.port, **uvicorn_options())
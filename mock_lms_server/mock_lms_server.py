@@ -7,30 +7,50 @@
 # - cross_device_sync: /api/messages/state/web, /api/messages/state/mobile
 # 전부 "테스트 통과" 지향으로 동작
 
-from flask import Flask, request, jsonify
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from time import time
-import uuid
-from collections import defaultdict
+from typing import Any, Dict, Optional
+from secrets import token_bytes, token_hex
+from collections import defaultdict, deque
+import os
+import sys
 
-app = Flask(__name__)
+# 스크립트/--app-dir로 실행돼도 공용 모듈(src.core)을 찾을 수 있게 저장소 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.server_common import DefaultResponse, uvicorn_options
+
+app = FastAPI(title="Mock LMS Server", default_response_class=DefaultResponse)
 
 # ------------------------------
 # In-memory stores
 # ------------------------------
-MESSAGES_BY_CHANNEL = defaultdict(list)   # channel -> [ {client_msg_id, to, text, ts} ]
+INBOX_LIMIT = 50                          # 채널별 보관/조회 메시지 수
+MESSAGES_BY_CHANNEL = defaultdict(lambda: deque(maxlen=INBOX_LIMIT))  # channel -> deque[{client_msg_id, to, text, ts}]
 THREAD_STATE = {"id": "t-1", "last_message": {"read": False}}
-BROADCASTS = {}                           # broadcast_id -> {"total": N, "delivered": N}
-NOTIFS_BY_USER = defaultdict(dict)        # user_token -> { event_key: {event_key, ts} }
+MAX_RECIPIENTS = 10_000                   # 방송 1건당 수신자 상한 (초과 시 422)
+MAX_BROADCASTS = 256                      # 보관할 방송 수 (초과 시 가장 오래된 것부터 삭제)
+BROADCASTS = {}                           # broadcast_id -> {"total": N, "delivered": N} (삽입순 = 시간순)
+BROADCAST_RECIPIENTS = {}                 # broadcast_id -> [recipient_id, ...] (status 응답에는 미포함)
+NOTIFS_BY_USER = defaultdict(dict)        # user_token -> { event_key: {event_key, ts} } (삽입순 = 시간순)
 STATE_WEB = {"threads": [{"last_message": {"read": True}}]}
 STATE_MOBILE = {"threads": [{"last_message": {"read": True}}]}
 
+async def read_json(request: Request) -> Dict[str, Any]:
+    """Flask의 get_json(silent=True)처럼 본문이 없거나 깨져도 빈 dict 반환"""
+    try:
+        data = await request.json()
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
 # ------------------------------
 # 1) 메시징 (전달 지연 측정)
 # ------------------------------
 @app.post("/api/messages/send")
-def send_message():
-    data = request.get_json(silent=True) or {}
-    mid = data.get("client_msg_id") or str(uuid.uuid4())
+async def send_message(request: Request):
+    data = await read_json(request)
+    mid = data.get("client_msg_id") or token_hex(16)
     channel = data.get("channel", "course-101")
     to = data.get("to", "studentA")
     text = data.get("text", "")
@@ -40,94 +60,107 @@ def send_message():
         "text": text,
         "ts": time()
     })
-    return jsonify({"ok": True, "client_msg_id": mid})
+    return {"ok": True, "client_msg_id": mid}
 
 @app.get("/api/messages/inbox")
-def inbox():
-    channel = request.args.get("channel", "course-101")
-    items = MESSAGES_BY_CHANNEL[channel][-50:]  # 최근 50개
-    return jsonify({"items": items})
+async def inbox(channel: str = "course-101"):
+    items = list(MESSAGES_BY_CHANNEL[channel])  # 최근 50개
+    return {"items": items}
 
 # ------------------------------
 # 2) 읽음(리드 레시트)
 # ------------------------------
 @app.get("/api/messages/thread")
-def get_thread():
+async def get_thread():
     # 예: last_message.read 경로를 기대
     # channel 파라미터는 무시하고 동일 스레드 반환
-    return jsonify({"thread": {"id": THREAD_STATE["id"]}, "last_message": THREAD_STATE["last_message"]})
+    return {"thread": {"id": THREAD_STATE["id"]}, "last_message": THREAD_STATE["last_message"]}
 
 @app.post("/api/messages/mark_read")
-def mark_read():
+async def mark_read():
     # body: {"thread_id": "..."}
     # 호출되면 바로 read=True로 반영
     THREAD_STATE["last_message"]["read"] = True
     # 교차기기 상태도 일치시킴
     STATE_WEB["threads"][0]["last_message"]["read"] = True
     STATE_MOBILE["threads"][0]["last_message"]["read"] = True
-    return jsonify({"ok": True})
+    return {"ok": True}
 
 # ------------------------------
 # 3) 방송(팬아웃)
 # ------------------------------
+def make_recipient_ids(n: int) -> list:
+    """수신자 ID n개를 한 번에 생성 (난수 바이트 1회 생성 + hex 1회 변환 후 16자씩 분할)"""
+    blob = token_bytes(8 * n).hex()
+    return [blob[i:i + 16] for i in range(0, 16 * n, 16)]
+
 @app.post("/api/announcements/send")
-def send_announcement():
-    data = request.get_json(silent=True) or {}
-    recipients = int(data.get("recipients", 300))
-    bid = str(uuid.uuid4())
+async def send_announcement(request: Request):
+    data = await read_json(request)
+    recipients = max(0, int(data.get("recipients", 300)))
+    if recipients > MAX_RECIPIENTS:
+        return JSONResponse(status_code=422,
+                            content={"ok": False, "error": f"recipients must be <= {MAX_RECIPIENTS}"})
+    # 오래된 방송부터 정리해서 메모리가 계속 늘지 않게 함
+    while len(BROADCASTS) >= MAX_BROADCASTS:
+        old = next(iter(BROADCASTS))
+        BROADCASTS.pop(old, None)
+        BROADCAST_RECIPIENTS.pop(old, None)
+    bid = token_hex(16)
+    BROADCAST_RECIPIENTS[bid] = make_recipient_ids(recipients)
     # 바로 전송 완료 상태로 만들어 성공률/지연 테스트를 PASS 하게 함
     BROADCASTS[bid] = {"total": recipients, "delivered": recipients, "ts": time()}
-    return jsonify({"broadcast_id": bid, "status": "queued"})
+    return {"broadcast_id": bid, "status": "queued"}
 
 @app.get("/api/announcements/status")
-def status_announcement():
-    bid = request.args.get("broadcast_id")
-    info = BROADCASTS.get(bid, {"total": 0, "delivered": 0})
-    return jsonify(info)
+async def status_announcement(broadcast_id: Optional[str] = None):
+    info = BROADCASTS.get(broadcast_id, {"total": 0, "delivered": 0})
+    return info
 
 # ------------------------------
 # 4) 중복/폭주 알림 제어
 # ------------------------------
 @app.post("/api/notifications/trigger")
-def trigger_notif():
-    data = request.get_json(silent=True) or {}
+async def trigger_notif(request: Request):
+    data = await read_json(request)
     # JSON 스펙과 맞추기: idempotency_key 필드가 들어오면 그걸 event_key로 사용
-    idem = data.get("idempotency_key") or str(uuid.uuid4())
+    idem = data.get("idempotency_key") or token_hex(16)
     # 요청자 토큰은 헤더 Authorization 또는 쿼리/바디 없이, 데모용으로 고정 수신자
     user = request.headers.get("X-USER", "studentA")
     # 아이덤포턴시: 같은 키는 한 번만 저장
     if idem not in NOTIFS_BY_USER[user]:
         NOTIFS_BY_USER[user][idem] = {"event_key": idem, "ts": time()}
-    return jsonify({"ok": True, "event_key": idem})
+    return {"ok": True, "event_key": idem}
 
 @app.get("/api/notifications/inbox")
-def notif_inbox():
+async def notif_inbox(request: Request):
     # Edu JSON에선 auth.user_token을 보냈지만, 데모에선 X-USER 헤더로 식별
     user = request.headers.get("X-USER", "studentA")
-    items = list(NOTIFS_BY_USER[user].values())
-    # 최신순 정렬
-    items.sort(key=lambda x: x["ts"], reverse=True)
-    return jsonify({"items": items})
+    # 새 키만 삽입되므로 dict 삽입 순서 == 시간 순서 → 뒤집기만 하면 최신순
+    items = list(reversed(NOTIFS_BY_USER[user].values()))
+    return {"items": items}
 
 # ------------------------------
 # 5) 교차기기 동기화
 # ------------------------------
 @app.get("/api/messages/state/web")
-def web_state():
+async def web_state():
     # channel은 무시하고 동일 상태 반환
-    return jsonify(STATE_WEB)
+    return STATE_WEB
 
 @app.get("/api/messages/state/mobile")
-def mobile_state():
-    return jsonify(STATE_MOBILE)
+async def mobile_state():
+    return STATE_MOBILE
 
 # ------------------------------
 # 헬스체크
 # ------------------------------
 @app.get("/health")
-def health():
-    return jsonify({"ok": True})
+async def health():
+    return {"ok": True}
+
 
 if __name__ == "__main__":
-    # 설치: pip install flask
-    app.run(host="0.0.0.0", port=8000)
+    # 설치: pip install fastapi uvicorn
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000, **uvicorn_options())
@@ -1,5 +1,7 @@
 # run_with_mock.py
-import argparse, subprocess, sys, time, socket, requests, os
+import argparse, subprocess, sys, time, socket, requests, os, threading
+import importlib.util
+from urllib.parse import urlsplit
 
 def tcp_ping(host: str, port: int, timeout: float = 1.0) -> bool:
     s = socket.socket()
@@ -15,16 +17,53 @@ def tcp_ping(host: str, port: int, timeout: float = 1.0) -> bool:
 
 def wait_health(url: str, timeout: float = 10.0) -> bool:
     deadline = time.time() + timeout
-    while time.time() < deadline:
-        try:
-            r = requests.get(url, timeout=0.5)
-            if r.ok:
-                return True
-        except Exception:
-            pass
-        time.sleep(0.2)
+    u = urlsplit(url)
+    host, port = u.hostname or "127.0.0.1", u.port or 80
+    # 재시도 간 같은 세션(keep-alive 연결)을 재사용
+    with requests.Session() as sess:
+        while time.time() < deadline:
+            # 포트가 열리기 전에는 가벼운 TCP 연결만 확인하고 HTTP 요청은 생략
+            if not tcp_ping(host, port, timeout=0.2):
+                time.sleep(0.05)
+                continue
+            try:
+                r = sess.get(url, timeout=0.5)
+                if r.ok:
+                    return True
+            except Exception:
+                pass
+            time.sleep(0.2)
     return False
 
+def start_inprocess_server(script: str, host: str, port: int, timeout: float = 12.0):
+    """모의 서버 스크립트의 ASGI app을 같은 프로세스의 uvicorn 스레드로 실행.
+    app을 불러올 수 없으면 None 반환 (호출 측에서 subprocess로 대체)"""
+    try:
+        import uvicorn
+        spec = importlib.util.spec_from_file_location("mock_lms_app", script)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        app = module.app
+    except Exception as e:
+        print(f"[WARN] 인프로세스 실행 불가({e}) → 별도 프로세스로 실행")
+        return None
+
+    loop = "auto"
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        pass
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, loop=loop, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + timeout
+    while not server.started:
+        if not thread.is_alive() or time.time() > deadline:
+            raise RuntimeError("모의 서버 기동 실패/타임아웃")
+        time.sleep(0.01)
+    return server, thread
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--server", default="mock_lms_server/mock_lms_server.py",
@@ -37,20 +76,28 @@ def main():
 
     server_up = tcp_ping(args.host, args.port)
     proc = None
+    inproc = None
     try:
         if not server_up:
             print(f"[INFO] 서버가 안 떠있음 → 모의 서버 실행: {args.server}")
-            # mock_lms_server.py가 기본 8000으로 뜨도록 작성됨
-            proc = subprocess.Popen([sys.executable, args.server])
-            ok = wait_health(f"http://{args.host}:{args.port}/health", timeout=12)
-            if not ok:
-                raise RuntimeError("모의 서버 /health 응답 대기 타임아웃")
+            inproc = start_inprocess_server(args.server, args.host, args.port)
+            if inproc is None:
+                # mock_lms_server.py가 기본 8000으로 뜨도록 작성됨
+                proc = subprocess.Popen([sys.executable, args.server])
+                ok = wait_health(f"http://{args.host}:{args.port}/health", timeout=12)
+                if not ok:
+                    raise RuntimeError("모의 서버 /health 응답 대기 타임아웃")
 
         # 루틴 실행 (run_routine.py가 인자로 받은 JSON을 후보에 포함)
         cmd = [sys.executable, "run_routine.py", args.routine]
         print(f"[INFO] 실행: {' '.join(cmd)}")
         subprocess.run(cmd, check=False)
     finally:
+        if inproc:
+            print("[INFO] 모의 서버 종료")
+            server, thread = inproc
+            server.should_exit = True
+            thread.join(timeout=3)
         if proc:
             print("[INFO] 모의 서버 종료")
             proc.terminate()
@@ -1,13 +1,21 @@
 from src.core.driver_backend import BackendDriver
 from src.core.runner import run_routine
+from src.core.routine_cache import get_default_cache, is_miss
 import os
+import re
 import sys
 import time
+import socket
 import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 import argparse
 import json
-from typing import List, Dict, Any
+from urllib.parse import urlsplit
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Set, Tuple
 from tabulate import tabulate
 from wcwidth import wcswidth
 
@@ -16,6 +24,15 @@ sys.path.insert(0, os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "src"))
 
 
+# orjson은 선택적 임포트 (없으면 표준 json 사용)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None  # type: ignore
+    HAS_ORJSON = False
+
+
 # Playwright 드라이버는 선택적 임포트
 try:
     from src.core.driver_playwright import PlaywrightDriver
@@ -27,14 +44,26 @@ except Exception:
 
 def list_json_files(base_dir: str = "src/routines") -> List[str]:
     paths: List[str] = []
-    for root, _, files in os.walk(base_dir):
-        for f in files:
-            if f.lower().endswith(".json"):
-                paths.append(os.path.join(root, f))
+    stack = [base_dir]
+    while stack:
+        root = stack.pop()
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    # DirEntry의 타입 정보를 사용해 항목마다 stat 호출을 피함
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(".json"):
+                        paths.append(entry.path)
+        except OSError:
+            continue
     return sorted(paths)
 
 
 def parse_routine(file_path: str) -> Any:
+    if HAS_ORJSON:
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
     with open(file_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -61,25 +90,95 @@ def normalize_routines(obj: Any) -> List[Dict[str, Any]]:
     return []
 
 
+def _parse_or_error(path: str) -> Tuple[Any, Optional[Exception]]:
+    # 프로세스 풀에서도 호출되므로 모듈 최상위 함수로 유지 (pickle 가능해야 함)
+    try:
+        return parse_routine(path), None
+    except Exception as e:
+        return None, e
+
+
+# 이 개수 이상을 새로 파싱해야 할 때만 프로세스 풀 사용 (적으면 프로세스 기동 비용이 더 큼)
+PROCESS_POOL_MIN_FILES = 16
+
+
+def _parse_many(paths: List[str]) -> List[Tuple[Any, Optional[Exception]]]:
+    if len(paths) >= PROCESS_POOL_MIN_FILES:
+        try:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+                return list(ex.map(_parse_or_error, paths, chunksize=8))
+        except Exception as e:
+            print(f"[WARN] 프로세스 풀 파싱 실패({e}) → 스레드 풀로 재시도")
+    with ThreadPoolExecutor(max_workers=min(16, len(paths))) as ex:
+        return list(ex.map(_parse_or_error, paths))
+
+
 def load_all_from_dir(dir_path: str = "src/routines") -> List[Dict[str, Any]]:
     routines: List[Dict[str, Any]] = []
     files = list_json_files(dir_path)
     print(f"[INFO] routines 폴더에서 JSON {len(files)}개 발견")
-    for p in files:
+    if not files:
+        return routines
+
+    # (경로, mtime, 크기)가 캐시와 같으면 파싱 생략. 캐시는 실행 간에도 디스크에 유지
+    cache = get_default_cache()
+    results: List[Tuple[Any, Optional[Exception]]] = [(None, None)] * len(files)
+    misses: List[Tuple[int, str, str, int, int]] = []
+    for i, p in enumerate(files):
         try:
-            data = parse_routine(p)
-        except Exception as e:
-            print(f"[WARN] '{p}' 로드 실패: {e}")
+            st = os.stat(p)
+        except OSError as e:
+            results[i] = (None, e)
+            continue
+        key = os.path.abspath(p)
+        data = cache.get(key, st.st_mtime_ns, st.st_size)
+        if is_miss(data):
+            misses.append((i, p, key, st.st_mtime_ns, st.st_size))
+        else:
+            results[i] = (data, None)
+
+    if misses:
+        parsed = _parse_many([m[1] for m in misses])
+        for (i, _, key, mtime_ns, size), (data, err) in zip(misses, parsed):
+            results[i] = (data, err)
+            if err is None:
+                cache.put(key, mtime_ns, size, data)
+        # 새로 파싱한 항목이 있을 때만 디스크에 기록
+        cache.save()
+
+    for p, (data, err) in zip(files, results):
+        if err is not None:
+            print(f"[WARN] '{p}' 로드 실패: {err}")
             continue
         rts = normalize_routines(data)
         if not rts:
             print(f"[WARN] '{p}'는 유효한 루틴 형식이 아닙니다(steps 없음)")
         for r in rts:
             r["_source"] = p
+            r["_basename"] = os.path.basename(p)
+            r["_kinds_preview"] = _kinds_preview(r)
+            r["_asmt_set"] = _assessment_set(r)
+            r["_haystack"] = _keyword_haystack(r)
         routines.extend(rts)
     return routines
 
 
+def group_by_driver(routines: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """드라이버별 루틴 목록. driver가 비어 있는 루틴은 모든 드라이버에서 실행 가능하므로
+    각 그룹에 원래 순서대로 함께 포함하고, "" 키에도 모아 둠"""
+    drivers = {(r.get("driver", "") or "").lower() for r in routines}
+    drivers.add("")
+    by_driver: Dict[str, List[Dict[str, Any]]] = {d: [] for d in drivers}
+    for r in routines:
+        drv = (r.get("driver", "") or "").lower()
+        if drv:
+            by_driver[drv].append(r)
+        else:
+            for group in by_driver.values():
+                group.append(r)
+    return by_driver
+
+
 def includes_reliability(routines: List[Dict[str, Any]]) -> bool:
     for r in routines:
         for s in r.get("steps", []):
@@ -88,16 +187,55 @@ def includes_reliability(routines: List[Dict[str, Any]]) -> bool:
     return False
 
 
+# 헬스체크용 공유 세션 (keep-alive로 연결 재사용, 재시도는 wait_health 루프가 담당)
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
+
+def _port_open(host: str, port: int, timeout: float = 0.2) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+# uvicorn이 소켓을 바인드한 뒤 찍는 로그. "Application startup complete"는
+# 바인드 전에 찍혀서 이 시점엔 아직 연결이 거부될 수 있음
+UVICORN_READY_MARKER = "Uvicorn running on"
+
+
+def start_output_watcher(proc: subprocess.Popen) -> threading.Event:
+    """서버 출력을 계속 읽어 파이프가 가득 차 멈추는 것을 막고,
+    기동 완료 로그가 보이면(또는 프로세스가 종료되면) 이벤트를 set"""
+    ready = threading.Event()
+
+    def _drain():
+        for line in proc.stdout:
+            if not ready.is_set() and UVICORN_READY_MARKER in line:
+                ready.set()
+        ready.set()
+
+    threading.Thread(target=_drain, daemon=True).start()
+    return ready
+
+
 def wait_health(url: str = "http://127.0.0.1:8000/health", timeout: int = 15) -> bool:
     t0 = time.time()
+    u = urlsplit(url)
+    host, port = u.hostname or "127.0.0.1", u.port or 80
+    delay = 0.1  # 재시도 간격: 0.1초에서 시작해 0.5초까지 지수 증가
     while time.time() - t0 < timeout:
-        try:
-            resp = requests.get(url, timeout=2)
-            if resp.status_code == 200:
-                return True
-        except Exception:
-            pass
-        time.sleep(0.5)
+        # 포트가 닫혀 있으면 HTTP 요청 없이 재시도
+        if _port_open(host, port):
+            try:
+                resp = SESSION.get(url, timeout=2)
+                if resp.status_code == 200:
+                    return True
+            except Exception:
+                pass
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
     return False
 
 
@@ -111,30 +249,38 @@ def pad_display(s: str, width: int) -> str:
     return s + (" " * max(0, pad))
 
 
-def summarize_routine(idx: int, r: Dict[str, Any]) -> List[str]:
-    drv = r.get("driver", "") or "(auto)"
-    name = r.get("name", "(noname)")
+def _kinds_preview(r: Dict[str, Any]) -> str:
+    """앞쪽 3개 step의 assessment 요약 (표의 Assessments 칸)"""
     kinds = [s.get("assessment")
              for s in r.get("steps", []) if isinstance(s, dict)][:3]
-    kinds_s = ",".join([k for k in kinds if k]) or "-"
-    src = os.path.basename(r.get("_source", "-"))
-    return [str(idx), name, drv, kinds_s, src]
+    return ",".join([k for k in kinds if k]) or "-"
+
+
+def summarize_routine(idx: int, r: Dict[str, Any]) -> List[str]:
+    # 번호를 제외한 나머지 칸은 루틴마다 고정이므로 처음 한 번만 만들어 루틴에 저장
+    payload = r.get("_summary_payload")
+    if payload is None:
+        drv = r.get("driver", "") or "(auto)"
+        name = r.get("name", "(noname)")
+        kinds_s = r.get("_kinds_preview") or _kinds_preview(r)
+        src = r.get("_basename") or os.path.basename(r.get("_source", "-"))
+        payload = r["_summary_payload"] = (name, drv, kinds_s, src)
+    return [str(idx), *payload]
 
 
 def print_routine_table(routines: List[Dict[str, Any]]) -> None:
     headers = ["번호", "이름", "드라이버", "Assessments", "소스"]
 
+    rows = [summarize_routine(i, r) for i, r in enumerate(routines, start=1)]
     col_widths = [0] * len(headers)
     for i, h in enumerate(headers):
         col_widths[i] = max(col_widths[i], wcswidth(h))
-    for i, r in enumerate(routines, start=1):
-        row = summarize_routine(i, r)
+    for row in rows:
         for j, cell in enumerate(row):
             col_widths[j] = max(col_widths[j], wcswidth(cell))
 
     table_rows: List[List[str]] = []
-    for i, r in enumerate(routines, start=1):
-        row = summarize_routine(i, r)
+    for row in rows:
         padded = [pad_display(cell, col_widths[j])
                   for j, cell in enumerate(row)]
         table_rows.append(padded)
@@ -145,61 +291,85 @@ def print_routine_table(routines: List[Dict[str, Any]]) -> None:
     print("============================\n")
 
 
+# 쉼표로 구분된 "N" 또는 "A-B" 토큰 하나와 일치 (앞뒤 공백 허용, 형식이 틀린 토큰은 무시)
+_RANGE_RE = re.compile(r"(?:^|(?<=,))\s*(\d+)(?:-(\d+))?\s*(?=,|$)")
+
+
 def parse_index_ranges(expr: str, n: int) -> List[int]:
     result = set()
-    for token in expr.split(","):
-        token = token.strip()
-        if not token:
-            continue
-        if "-" in token:
-            a, b = token.split("-", 1)
-            if a.isdigit() and b.isdigit():
-                lo, hi = int(a), int(b)
-                if lo <= hi:
-                    for k in range(lo, hi + 1):
-                        if 1 <= k <= n:
-                            result.add(k)
-        else:
-            if token.isdigit():
-                k = int(token)
-                if 1 <= k <= n:
-                    result.add(k)
+    for m in _RANGE_RE.finditer(expr):
+        lo = int(m.group(1))
+        hi = int(m.group(2)) if m.group(2) else lo
+        result.update(range(max(1, lo), min(n, hi) + 1))
     return sorted(result)
 
 
-def filter_by_keyword(routines: List[Dict[str, Any]], keyword: str) -> List[Dict[str, Any]]:
-    kw = keyword.lower()
-    out: List[Dict[str, Any]] = []
+def _keyword_haystack(r: Dict[str, Any]) -> str:
+    """키워드 검색 대상(이름, 소스 경로, 각 step의 url/assessment)을 소문자로 이어 붙인 문자열.
+    구분자 \0은 키워드에 나올 수 없으므로 필드 경계를 넘는 일치가 생기지 않음"""
+    fields = [r.get("name", "") or "", r.get("_source", "") or ""]
+    for s in r.get("steps", []):
+        if isinstance(s, dict):
+            fields.append(s.get("url", "") or "")
+            fields.append(s.get("assessment", "") or "")
+    return "\0".join(fields).lower()
+
+
+def _haystack(r: Dict[str, Any]) -> str:
+    hay = r.get("_haystack")
+    return hay if hay is not None else _keyword_haystack(r)
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def build_keyword_index(routines: List[Dict[str, Any]]) -> Dict[str, Set[int]]:
+    """3-gram → 루틴(id) 역색인. 키워드의 모든 3-gram을 가진 루틴만 후보로 남김"""
+    index: Dict[str, Set[int]] = defaultdict(set)
     for r in routines:
-        if kw in (r.get("name", "") or "").lower():
-            out.append(r)
-            continue
-        if kw in (r.get("_source", "") or "").lower():
-            out.append(r)
-            continue
-        for s in r.get("steps", []):
-            if isinstance(s, dict):
-                if kw in (s.get("url", "") or "").lower():
-                    out.append(r)
-                    break
-                if kw in (s.get("assessment", "") or "").lower():
-                    out.append(r)
-                    break
-    return out
+        rid = id(r)
+        for g in _trigrams(_haystack(r)):
+            index[g].add(rid)
+    return dict(index)
+
+
+def filter_by_keyword(routines: List[Dict[str, Any]], keyword: str,
+                      index: Optional[Dict[str, Set[int]]] = None) -> List[Dict[str, Any]]:
+    kw = keyword.lower()
+    candidates: Optional[Set[int]] = None
+    if index is not None and len(kw) >= 3:
+        # 가장 짧은 posting부터 교집합 → 후보가 없으면 바로 종료
+        postings = sorted((index.get(g, set()) for g in _trigrams(kw)), key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            if not candidates:
+                break
+            candidates &= p
+        if not candidates:
+            return []
+    if candidates is None:
+        return [r for r in routines if kw in _haystack(r)]
+    # 3-gram은 후보 선별용이므로 실제 부분 문자열 일치를 다시 확인
+    return [r for r in routines if id(r) in candidates and kw in _haystack(r)]
+
+
+def _assessment_set(r: Dict[str, Any]) -> frozenset:
+    return frozenset((s.get("assessment", "") or "").lower()
+                     for s in r.get("steps", []) if isinstance(s, dict))
 
 
 def filter_by_assessment(routines: List[Dict[str, Any]], kinds: List[str]) -> List[Dict[str, Any]]:
-    want = set(k.strip().lower() for k in kinds if k.strip())
-    out: List[Dict[str, Any]] = []
-    for r in routines:
-        kinds_in = {(s.get("assessment", "") or "").lower()
-                    for s in r.get("steps", []) if isinstance(s, dict)}
-        if kinds_in & want:
-            out.append(r)
-    return out
+    want = frozenset(k.strip().lower() for k in kinds if k.strip())
+    if not want:
+        return []
+    # 로드 시 계산해 둔 _asmt_set 사용 (없으면 즉석 계산)
+    return [r for r in routines
+            if not (r.get("_asmt_set") or _assessment_set(r)).isdisjoint(want)]
 
 
-def select_routines_interactive(all_target: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def select_routines_interactive(all_target: List[Dict[str, Any]],
+                                kw_index: Optional[Dict[str, Set[int]]] = None) -> List[Dict[str, Any]]:
     while True:
         print_routine_table(all_target)
         print("실행할 테스트를 선택하세요:")
@@ -224,7 +394,7 @@ def select_routines_interactive(all_target: List[Dict[str, Any]]) -> List[Dict[s
 
         if sel == "k":
             kw = input("키워드: ").strip()
-            picked = filter_by_keyword(all_target, kw)
+            picked = filter_by_keyword(all_target, kw, kw_index)
             if not picked:
                 print("[INFO] 키워드 매칭 결과가 없습니다. 전체 실행으로 대체합니다.")
                 return all_target
@@ -253,13 +423,14 @@ def select_routines_interactive(all_target: List[Dict[str, Any]]) -> List[Dict[s
         return all_target
 
 
-def select_routines_cli(all_target: List[Dict[str, Any]], args: argparse.Namespace) -> List[Dict[str, Any]]:
+def select_routines_cli(all_target: List[Dict[str, Any]], args: argparse.Namespace,
+                        kw_index: Optional[Dict[str, Set[int]]] = None) -> List[Dict[str, Any]]:
     if args.run == "all":
         return all_target
 
     picked = all_target
     if args.filter:
-        picked = filter_by_keyword(picked, args.filter)
+        picked = filter_by_keyword(picked, args.filter, kw_index)
     if args.assessment:
         kinds = [k.strip() for k in args.assessment.split(",") if k.strip()]
         picked = filter_by_assessment(picked, kinds)
@@ -291,6 +462,8 @@ if __name__ == "__main__":
         if not routines:
             print("[INFO] 'src/routines'에서 JSON을 찾지 못했습니다. 종료합니다.")
             sys.exit(0)
+        kw_index = build_keyword_index(routines)
+        by_driver = group_by_driver(routines)
 
         print("사용할 드라이버를 선택하세요:")
         print("1. BackendDriver (가상 드라이버 - 콘솔 출력)")
@@ -308,17 +481,17 @@ if __name__ == "__main__":
             selected_driver = "backend"
             print("BackendDriver를 선택했습니다.")
 
-        all_target = [r for r in routines if r.get(
-            "driver", "").lower() in ("", selected_driver)]
+        # 드라이버 지정 없는 루틴만 있는 경우 "" 그룹 사용
+        all_target = by_driver.get(selected_driver, by_driver[""])
         print(f"[INFO] '{selected_driver}' 대상 루틴: {len(all_target)}개")
         if not all_target:
             print("[INFO] 실행 가능한 루틴이 없습니다. 종료합니다.")
             sys.exit(0)
 
         if args.run or args.pick or args.filter or args.assessment:
-            target = select_routines_cli(all_target, args)
+            target = select_routines_cli(all_target, args, kw_index)
         else:
-            target = select_routines_interactive(all_target)
+            target = select_routines_interactive(all_target, kw_index)
 
         print(f"[INFO] 실제 실행 루틴 수: {len(target)}개")
         if not target:
@@ -328,19 +501,25 @@ if __name__ == "__main__":
         server = None
         try:
             if selected_driver == "backend" and includes_reliability(target):
-                if wait_health():
+                # 포트가 닫혀 있으면 15초 대기 없이 바로 자동 기동으로 진행
+                if _port_open("127.0.0.1", 8000) and wait_health(timeout=3):
                     print("[INFO] 기존 서버 감지. 재기동 생략")
                 else:
                     try:
                         import uvicorn  # noqa: F401
                         server = subprocess.Popen(
                             [sys.executable, "-m", "uvicorn", "server:app",
+                             "--app-dir", "OSC_test_server",
                              "--host", "127.0.0.1", "--port", "8000"],
                             stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                            text=True
+                            text=True, bufsize=1
                         )
                         print("[INFO] 서버 부팅 대기…")
-                        if not wait_health():
+                        ready = start_output_watcher(server)
+                        ready.wait(timeout=15)
+                        # 로그 마커는 힌트로만 쓰고 실제 응답은 헬스체크로 확인
+                        # (이미 떠 있으면 첫 시도에서 바로 통과)
+                        if server.poll() is not None or not wait_health():
                             print("[WARN] /health 응답 대기 초과")
                     except Exception as e:
                         print(f"[WARN] 서버 자동 기동 실패: {e}. 계속 진행")
@@ -8,15 +8,21 @@
 2) 실제 로딩까지 확인(토크나이저/모델 메모리 로딩):
    python scripts/preload_model.py
 
+3) 캐시만 사용(네트워크 확인 생략):
+   EDU_OFFLINE=1 python scripts/preload_model.py
+
 [런타임 사용]
 from scripts.preload_model import get_tokenizer_model
 select 1) tokenizer, model = get_tokenizer_model()  # 최초 1회 로딩, 이후 재사용
 select 2) tokenizer, model = get_tokenizer_model(verbose=False)  # 로그 없이 1회 로딩
+with inference(): model.generate(...)  # autograd 기록 없이 생성
 """
 from __future__ import annotations
 
 import argparse
 import os
+import threading
+from contextlib import contextmanager
 import torch
 from transformers import AutoTokenizer, AutoModelForCausalLM
 from typing import Optional, Tuple
@@ -30,6 +36,8 @@ except Exception:
 # 설정
 # -----------------------------
 CHECKPOINT = os.environ.get("EDU_MODEL_CHECKPOINT", "bigcode/starcoder2-3b")
+# EDU_OFFLINE=1 이면 런타임 로딩 시 네트워크 확인 없이 로컬 캐시만 사용
+OFFLINE = os.environ.get("EDU_OFFLINE") == "1"
 
 if torch.backends.mps.is_available():
     DEVICE = "mps"
@@ -41,12 +49,24 @@ else:
 # mps/cuda는 float16, cpu는 float32 권장
 DTYPE = torch.float16 if DEVICE in ("mps", "cuda") else torch.float32
 
+# 가중치 양자화 (EDU_MODEL_QUANT)
+# - auto(기본): cuda + bitsandbytes 설치 시 4bit(NF4), 그 외에는 양자화 없음
+# - 4bit / 8bit: bitsandbytes 사용 (cuda 전용)
+# - int8: cpu에서 Linear 레이어 동적 int8 양자화
+# - none: 양자화 끔
+QUANT = os.environ.get("EDU_MODEL_QUANT", "auto").lower()
+
+# EDU_TORCH_COMPILE=1 이면 cuda에서 static KV 캐시 + model.forward에 torch.compile(mode="reduce-overhead") 적용
+# (generate()는 컴파일된 모듈의 forward를 거치지 않으므로 forward 자체를 교체. 로딩 시 짧은 생성으로 컴파일까지 끝냄)
+TORCH_COMPILE = os.environ.get("EDU_TORCH_COMPILE") == "1"
+
 
 # -----------------------------
 # 모듈 내부 싱글톤 (프로세스 내 1회만 로드)
 # -----------------------------
 TOKENIZER = None
 MODEL = None
+_LOAD_LOCK = threading.Lock()  # 여러 스레드가 동시에 호출해도 모델은 한 번만 로드
 
 def log(msg: str, verbose: bool):
     if verbose:
@@ -62,10 +82,48 @@ def download_only(verbose: bool = True) -> None:
         return
     cache_dir = os.environ.get("HF_HOME")  # 설정되어 있다면 해당 경로 사용
     print(f"[preload] snapshot_download: repo_id={CHECKPOINT}, cache_dir={cache_dir or '(default)'}")
+    try:
+        # 캐시가 이미 완전하면 허브에 etag 확인 요청을 보내지 않고 종료
+        snapshot_download(repo_id=CHECKPOINT, local_files_only=True)
+        print("[preload] 캐시에 이미 존재 (다운로드 생략)")
+        return
+    except Exception:
+        pass
     snapshot_download(repo_id=CHECKPOINT, local_files_only=False)
     print("[preload] 캐시 다운로드 완료")
 
 
+def _attn_implementation() -> str:
+    """cuda + flash-attn 설치 시 FlashAttention-2, 그 외에는 PyTorch SDPA 융합 커널"""
+    if DEVICE == "cuda":
+        try:
+            import flash_attn  # noqa: F401
+            return "flash_attention_2"
+        except ImportError:
+            pass
+    return "sdpa"
+
+
+def _bnb_quant_kwargs() -> dict:
+    """from_pretrained에 넘길 bitsandbytes 양자화 인자. 적용 불가하면 빈 dict"""
+    mode = "4bit" if QUANT == "auto" else QUANT
+    if DEVICE != "cuda" or mode not in ("4bit", "8bit"):
+        return {}
+    try:
+        import bitsandbytes  # noqa: F401
+        from transformers import BitsAndBytesConfig
+    except ImportError:
+        if QUANT != "auto":
+            print("[preload] bitsandbytes 미설치로 양자화를 생략합니다.")
+        return {}
+    if mode == "4bit":
+        cfg = BitsAndBytesConfig(load_in_4bit=True, bnb_4bit_quant_type="nf4",
+                                 bnb_4bit_compute_dtype=torch.float16)
+    else:
+        cfg = BitsAndBytesConfig(load_in_8bit=True)
+    return {"quantization_config": cfg, "device_map": "auto"}
+
+
 def load_runtime(verbose: bool = True) -> Tuple[AutoTokenizer, AutoModelForCausalLM]:
     """
     토크나이저/모델을 실제 메모리에 로드. 캐시에 있으면 재다운로드 없음.
@@ -74,21 +132,76 @@ def load_runtime(verbose: bool = True) -> Tuple[AutoTokenizer, AutoModelForCausa
     if TOKENIZER is not None and MODEL is not None:
         return TOKENIZER, MODEL
 
-    log(f"[preload] device={DEVICE}", verbose)
-    TOKENIZER = AutoTokenizer.from_pretrained(CHECKPOINT)
-    MODEL = AutoModelForCausalLM.from_pretrained(CHECKPOINT, torch_dtype=DTYPE)
-    MODEL = MODEL.to(DEVICE)
-
-    # pad/eos 안전 설정(일부 모델에서 pad 누락되는 문제 대응)
-    if getattr(TOKENIZER, "pad_token_id", None) is None:
-        eos_tok = getattr(TOKENIZER, "eos_token", None)
-        if eos_tok is not None:
-            TOKENIZER.pad_token = eos_tok
+    with _LOAD_LOCK:
+        # 락을 기다리는 동안 다른 스레드가 이미 로드했을 수 있으므로 재확인
+        if TOKENIZER is not None and MODEL is not None:
+            return TOKENIZER, MODEL
+
+        log(f"[preload] device={DEVICE}", verbose)
+        tokenizer = AutoTokenizer.from_pretrained(CHECKPOINT, local_files_only=OFFLINE)
+        quant_kwargs = _bnb_quant_kwargs()
+        attn_impl = _attn_implementation()
+        try:
+            model = AutoModelForCausalLM.from_pretrained(CHECKPOINT, torch_dtype=DTYPE, local_files_only=OFFLINE,
+                                                         attn_implementation=attn_impl, **quant_kwargs)
+        except (ImportError, ValueError) as e:
+            # 모델/환경이 해당 어텐션 구현을 지원하지 않으면 기본 구현으로 재시도
+            log(f"[preload] attn_implementation={attn_impl} 사용 불가({e}) → 기본값으로 로드", verbose)
+            attn_impl = "default"
+            model = AutoModelForCausalLM.from_pretrained(CHECKPOINT, torch_dtype=DTYPE, local_files_only=OFFLINE,
+                                                         **quant_kwargs)
+        log(f"[preload] attention={attn_impl}", verbose)
+        model.config.use_cache = True  # generate 시 KV 캐시 사용
+        if quant_kwargs:
+            # device_map="auto"로 이미 배치됨 (양자화 모델은 .to() 불가)
+            log(f"[preload] bitsandbytes 양자화 적용 ({'8bit' if QUANT == '8bit' else '4bit'})", verbose)
+        else:
+            model = model.to(DEVICE)
+            if DEVICE == "cpu" and QUANT == "int8":
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+                log("[preload] cpu 동적 int8 양자화 적용", verbose)
+        model.eval()  # 추론 전용: dropout 등 학습 모드 동작 비활성화
+        if TORCH_COMPILE and DEVICE == "cuda":
+            # 동적 KV 캐시는 스텝마다 텐서 크기가 바뀌어 재컴파일이 반복되므로 static 캐시가 필요
+            gen_cfg = getattr(model, "generation_config", None)
+            if quant_kwargs or gen_cfg is None or not hasattr(gen_cfg, "cache_implementation"):
+                log("[preload] static KV 캐시 미지원(양자화 모델 또는 구버전 transformers) → torch.compile 생략", verbose)
+            else:
+                orig_forward = model.forward
+                try:
+                    gen_cfg.cache_implementation = "static"
+                    model.forward = torch.compile(orig_forward, mode="reduce-overhead", fullgraph=False)
+                    # torch.compile은 지연 컴파일이라 실제 오류는 첫 호출에서 나옴 → 여기서 짧게 한 번 생성해서 확인
+                    warm = tokenizer("warmup", return_tensors="pt").to(DEVICE)
+                    with torch.inference_mode():
+                        model.generate(**warm, max_new_tokens=2, do_sample=False,
+                                       pad_token_id=tokenizer.pad_token_id or tokenizer.eos_token_id)
+                    log("[preload] static KV 캐시 + torch.compile(model.forward) 적용", verbose)
+                except Exception as e:
+                    model.forward = orig_forward
+                    gen_cfg.cache_implementation = None
+                    log(f"[preload] torch.compile 실패({e}) → 컴파일 없이 사용", verbose)
+
+        # pad/eos 안전 설정(일부 모델에서 pad 누락되는 문제 대응)
+        if getattr(tokenizer, "pad_token_id", None) is None:
+            eos_tok = getattr(tokenizer, "eos_token", None)
+            if eos_tok is not None:
+                tokenizer.pad_token = eos_tok
+
+        # 설정이 끝난 뒤에 공개해야 락 밖의 빠른 경로가 반쯤 준비된 객체를 보지 않음
+        TOKENIZER, MODEL = tokenizer, model
 
     log("[preload] 모델 로딩 완료 (캐시 사용 가능)", verbose)
     return TOKENIZER, MODEL
 
 
+@contextmanager
+def inference():
+    """추론 전용 컨텍스트. no_grad보다 가벼운 inference_mode 사용 (스레드마다 적용 필요)"""
+    with torch.inference_mode():
+        yield
+
+
 def get_tokenizer_model(verbose: bool = False) -> Tuple[AutoTokenizer, AutoModelForCausalLM]:
     """런타임 진입점. 기본은 조용히(verbose=False) 1회만 로드."""
     return load_runtime(verbose=verbose)
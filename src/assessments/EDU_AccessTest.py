@@ -1,6 +1,7 @@
 # src/assessments/EDU_AccessTest.py
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 from playwright.sync_api import Page
@@ -9,6 +10,10 @@ from typing import Dict, Any
 # 테스트 서버 URL 설정
 BASE_URL = "http://127.0.0.1:8000"
 
+# 로그인/관리자 API 요청이 같은 keep-alive 연결을 재사용하도록 모듈 공유 세션 사용
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
 def check(driver, step: Dict[str, Any]):
     """
     runner.py에 의해 호출되는 메인 함수.
@@ -38,7 +43,7 @@ def _test_backend_access_control():
     login_payload = {"username": "user", "password": "pass"}
     
     try:
-        response = requests.post(login_url, json=login_payload)
+        response = SESSION.post(login_url, json=login_payload)
         response.raise_for_status()
         user_token = response.json().get("access_token")
         
@@ -52,7 +57,7 @@ def _test_backend_access_control():
         headers = {"Authorization": f"Bearer {user_token}", "Content-Type": "application/json"}
         admin_payload = {"overloaded": True, "failure_rate": 0.5, "extra_latency_ms": 100}
         
-        response = requests.post(admin_api_url, headers=headers, json=admin_payload)
+        response = SESSION.post(admin_api_url, headers=headers, json=admin_payload)
         
         if response.status_code == 403:
             print("성공: 접근 제어 테스트: 올바르게 403 Forbidden 응답을 받았습니다.")
@@ -80,13 +85,14 @@ def _test_playwright_access_control(page: Page):
     
     # 2. URL 직접 입력으로 관리자 페이지 접근 시도
     admin_url = f"{BASE_URL}/admin/toggle_overload"
-    page.goto(admin_url, wait_until="networkidle")
+    # API 응답 페이지라 후속 네트워크 요청이 없으므로 networkidle(500ms 대기) 대신 DOM 로드까지만 대기
+    page.goto(admin_url, wait_until="domcontentloaded")
 
-    # 3. 페이지 콘텐츠 확인
-    content = page.content()
-    if "Not an administrator" in content:
+    # 3. 페이지 콘텐츠 확인 (전체 DOM 직렬화 대신 브라우저 측 텍스트 검색)
+    if page.get_by_text("Not an administrator").count() > 0:
         print("성공: 권한 우회 테스트: 'Not an administrator' 메시지를 확인했습니다.")
-    elif "ok" in content:
+    elif page.get_by_text("ok").count() > 0:
         print("실패: 권한 우회 테스트: 관리자 페이지에 접근할 수 있습니다.")
     else:
+        content = page.locator("body").inner_text()
         print(f"경고: 예상치 못한 페이지 콘텐츠. 첫 100자: {content[:100]}")
\ No newline at end of file
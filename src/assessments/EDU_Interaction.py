@@ -9,16 +9,33 @@
 # - 접근성 라벨/대체텍스트 & 읽음 공개 범위(UI, Playwright)
 
 from __future__ import annotations
-import time, math, uuid, json
-from typing import Any, Dict, List, Optional
+import asyncio, threading, time, math, random, uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 
 try:
     # 선택 의존성: 실시간 채팅 테스트에만 사용
     import websockets  # type: ignore
-except Exception:  # noqa: E722
+except ImportError:
     websockets = None
 
+try:
+    # 선택 의존성: 비동기 검사(교차기기/중복/실시간채팅) 이벤트 루프 가속
+    import uvloop  # type: ignore
+except ImportError:
+    uvloop = None
+
+# 선택 의존성: 폴링 응답 JSON 디코딩 가속 (없으면 표준 json)
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 # performance 유틸 재사용(있으면 사용)
 try:
     from assessments.performance import summarize, judge, percentile
@@ -61,46 +78,128 @@ except Exception:
 # ------------------------------------------------------------
 # 공통 유틸
 # ------------------------------------------------------------
+# 폴링 루프가 매 요청마다 새 연결을 맺지 않도록 keep-alive 공유 세션 사용
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+@lru_cache(maxsize=256)
+def _compile_path(path: str) -> Tuple[Tuple[str, Optional[int]], ...]:
+    """'a.0.b' → (("a", None), ("0", 0), ("b", None)) : 폴링마다 split/int 변환 반복 방지"""
+    tokens = []
+    for key in path.split('.'):
+        try:
+            idx: Optional[int] = int(key)
+        except ValueError:
+            idx = None
+        tokens.append((key, idx))
+    return tuple(tokens)
+
 def _get_by_path(obj: Any, path: Optional[str]) -> Any:
     """JSON에서 'a.b.c' 경로 값 안전 추출 (없으면 None)"""
     if not path:
         return None
     cur = obj
-    for key in path.split('.'):
+    for key, idx in _compile_path(path):
         if cur is None:
             return None
         if isinstance(cur, dict):
             cur = cur.get(key)
         elif isinstance(cur, list):
+            if idx is None:
+                return None
             try:
-                idx = int(key)
                 cur = cur[idx]
-            except Exception:
+            except IndexError:
                 return None
         else:
             return None
     return cur
 
-def _headers(token: Optional[str] = None, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+def _poll_waits(step: Dict[str, Any], max_s: float) -> Iterator[float]:
+    """폴링 대기 간격: poll_min_s(기본 25ms)에서 시작해 1.6배씩 늘려 poll_max_s(기본=기존 고정 간격)에서 유지
+    초반 변화는 빨리 잡고, 오래 걸리는 경우엔 요청 수를 줄임. 동시 폴러끼리 박자가 겹치지 않게 10% 지터"""
+    cap = float(step.get("poll_max_s", max_s))
+    d = min(float(step.get("poll_min_s", 0.025)), cap)
+    while True:
+        yield d + random.uniform(0, d * 0.1)
+        d = min(cap, d * 1.6)
+
+def _json(resp) -> Any:
+    """requests/httpx 응답 본문 디코딩 (r.json() 대신 orjson 경로 사용)"""
+    return _loads(resp.content)
+
+def _subst(node: Any, i: str) -> Any:
+    """메시지 템플릿의 문자열 값에 있는 {i}만 치환한 사본 반환 (JSON 직렬화 왕복 없이, 키는 그대로)"""
+    if isinstance(node, dict):
+        return {k: _subst(v, i) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_subst(x, i) for x in node]
+    if isinstance(node, str) and "{i}" in node:
+        return node.replace("{i}", i)
+    return node
+
+@lru_cache(maxsize=16)
+def _base_headers(token: Optional[str] = None) -> Mapping[str, str]:
+    """토큰별 기본 헤더를 한 번만 만들어 재사용 (읽기 전용 → 폴링 루프에서 그대로 전달해도 안전)"""
     h = {"Content-Type": "application/json"}
     if token:
         h["Authorization"] = f"Bearer {token}"
+    return MappingProxyType(h)
+
+def _headers(token: Optional[str] = None, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    h = dict(_base_headers(token))
     if extra:
         h.update(extra)
     return h
 
 def _post(url: str, payload: Dict[str, Any], token: Optional[str] = None, timeout: float = 10.0, headers: Optional[Dict[str,str]] = None) -> requests.Response:
-    h = _headers(token)
-    if headers:
-        h.update(headers)
-    return requests.post(url, headers=h, json=payload, timeout=timeout)
+    h = {**_base_headers(token), **headers} if headers else _base_headers(token)
+    return _SESSION.post(url, headers=h, json=payload, timeout=timeout)
 
 def _get(url: str, token: Optional[str] = None, timeout: float = 10.0, headers: Optional[Dict[str,str]] = None) -> requests.Response:
-    h = _headers(token)
-    if headers:
-        h.update(headers)
-    return requests.get(url, headers=h, timeout=timeout)
-
+    h = {**_base_headers(token), **headers} if headers else _base_headers(token)
+    return _SESSION.get(url, headers=h, timeout=timeout)
+
+def _get_if_changed(url: str, etag: Optional[str], token: Optional[str] = None, headers: Optional[Dict[str,str]] = None):
+    """ETag를 아는 경우 If-None-Match 조건부 GET.
+    변경 없음(304)이면 (None, etag) → 호출측은 직전 파싱 결과를 재사용. 아니면 (파싱된 JSON, 새 ETag)"""
+    h = dict(headers) if headers else {}
+    if etag:
+        h["If-None-Match"] = etag
+    r = _get(url, token=token, headers=h)
+    if r.status_code == 304:
+        return None, etag
+    return _json(r), r.headers.get("ETag")
+
+# 동시에 보내도 되는 요청(웹/모바일 상태 조회, 중복 트리거 등)은 AsyncClient + gather로 병렬 처리
+_ALIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+def _async_client() -> httpx.AsyncClient:
+    # AsyncClient는 이벤트 루프에 묶이므로 asyncio.run 호출마다 새로 생성
+    return httpx.AsyncClient(limits=_ALIMITS, timeout=10.0)
+
+def _new_loop() -> asyncio.AbstractEventLoop:
+    # uvloop이 있으면 사용 (WebSocket 송수신/다중 요청 오버헤드 감소), 없으면 기본 루프
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+def _arun(coro: Coroutine[Any, Any, Any]) -> Any:
+    if hasattr(asyncio, "Runner"):  # 3.11+: 전역 정책 변경 없이 루프 팩토리 지정
+        with asyncio.Runner(loop_factory=_new_loop) as runner:
+            return runner.run(coro)
+    return asyncio.run(coro)
+
+def _run_async(make_coro: Callable[[], Coroutine[Any, Any, Any]]) -> Any:
+    """check()는 동기 함수이므로 코루틴을 동기로 실행 (이미 루프가 도는 환경이면 별도 스레드에서)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return _arun(make_coro())
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(lambda: _arun(make_coro())).result()
 
 # ------------------------------------------------------------
 # 엔트리 포인트
@@ -150,44 +249,73 @@ def _messaging_latency(step: Dict[str, Any]) -> Dict[str, Any]:
     threshold_s: float = float(step.get("threshold_s", 3.0))
     rule: str = step.get("rule", "p95<=threshold")
 
-    samples: List[float] = []
-
     print("\n[INTERACTION > 메시징 전달 지연]")
-    for i in range(repeats):
-        msg_id = str(uuid.uuid4())
-        payload = json.loads(json.dumps(message_tmpl).replace("{i}", str(i)))
-        payload[id_field] = msg_id
 
+    # 반복마다 독립 표본이므로 전송은 스레드풀로 한꺼번에, 수신함은 폴러 하나가 모든 msg_id를 함께 확인
+    msg_ids = [str(uuid.uuid4()) for _ in range(repeats)]
+    pending: Dict[str, float] = {}      # 전송 성공했고 아직 수신 확인 안 된 msg_id -> t0
+    delays: Dict[str, float] = {}       # msg_id -> 지연(초), 실패/타임아웃은 inf
+    timed_out = set()
+    lock = threading.Lock()
+
+    def send(i: int, msg_id: str) -> None:
+        payload = _subst(message_tmpl, str(i))
+        payload[id_field] = msg_id
         t0 = time.perf_counter()
         try:
             r = _post(send_url, payload, token=sender_token, headers=headers)
             r.raise_for_status()
         except Exception as e:
             print(f"  - 전송 실패: {e}")
-            samples.append(float("inf"))
-            continue
-
-        # 수신함 폴링: msg_id가 나타날 때까지 대기
-        found = False
-        deadline = t0 + timeout_s
-        while time.perf_counter() < deadline:
-            try:
-                ir = _get(inbox_url, token=receiver_token, headers=headers)
-                data = ir.json()
-                items = _get_by_path(data, list_path) or []
-                for it in items:
-                    if _get_by_path(it, id_path) == msg_id:
-                        found = True
-                        break
-                if found:
+            with lock:
+                delays[msg_id] = float("inf")
+            return
+        with lock:
+            if msg_id not in delays:
+                pending[msg_id] = t0
+
+    inbox_etag: Optional[str] = None
+    got_ids: Set[str] = set()
+    waits = _poll_waits(step, poll_interval_s)
+    if repeats > 0:
+        with ThreadPoolExecutor(max_workers=min(32, repeats)) as ex:
+            futs = [ex.submit(send, i, mid) for i, mid in enumerate(msg_ids)]
+            while True:
+                with lock:
+                    waiting = bool(pending)
+                if not waiting and all(f.done() for f in futs):
                     break
-            except Exception:
-                pass
-            time.sleep(poll_interval_s)
+                try:
+                    # 304면 직전 id 집합 재검사 (전송 응답 전에 이미 수신함에 들어와 있던 msg_id 누락 방지)
+                    data, inbox_etag = _get_if_changed(inbox_url, inbox_etag, token=receiver_token, headers=headers)
+                    if data is not None:
+                        items = _get_by_path(data, list_path) or []
+                        # 수신함 id를 집합으로 한 번만 추출 → 대기 중 id와 교집합만 처리 (304면 그대로 재사용)
+                        got_ids = {mid for mid in (_get_by_path(it, id_path) for it in items) if isinstance(mid, str)}
+                    now = time.perf_counter()
+                    with lock:
+                        for mid in pending.keys() & got_ids:
+                            delays[mid] = now - pending.pop(mid)
+                except Exception:
+                    pass
+                # msg_id별 timeout_s 경과분은 TIMEOUT 처리
+                now = time.perf_counter()
+                with lock:
+                    for mid, t0 in list(pending.items()):
+                        if now - t0 >= timeout_s:
+                            del pending[mid]
+                            delays[mid] = float("inf")
+                            timed_out.add(mid)
+                time.sleep(next(waits))
 
-        dt = time.perf_counter() - t0
-        samples.append(dt if found else float("inf"))
-        print(f"  - #{i+1:02d} 지연 = {dt:.3f}s {'(FOUND)' if found else '(TIMEOUT)'}")
+    samples: List[float] = []
+    for i, mid in enumerate(msg_ids):
+        dt = delays.get(mid, float("inf"))
+        samples.append(dt)
+        if mid in timed_out:
+            print(f"  - #{i+1:02d} 지연 = {timeout_s:.3f}s (TIMEOUT)")
+        elif math.isfinite(dt):
+            print(f"  - #{i+1:02d} 지연 = {dt:.3f}s (FOUND)")
 
     stats = summarize(samples)
     ok, reason = judge(stats, threshold_s, rule)
@@ -226,7 +354,7 @@ def _read_receipt_latency(step: Dict[str, Any]) -> Dict[str, Any]:
         try:
             tr = _get(sender_thread_url, token=sender_token, headers=headers)
             tr.raise_for_status()
-            tdata = tr.json()
+            tdata = _json(tr)
             tid = thread_id or _get_by_path(tdata, thread_id_path)
         except Exception as e:
             print(f"  - 스레드 조회 실패: {e}")
@@ -246,17 +374,21 @@ def _read_receipt_latency(step: Dict[str, Any]) -> Dict[str, Any]:
 
         # 3) 강사 화면 폴링 → read_flag true 확인
         found = False
+        etag: Optional[str] = None
+        data2: Any = None
+        waits = _poll_waits(step, 0.5)
         while time.perf_counter() - t0 < threshold_s:
             try:
-                tr2 = _get(sender_thread_url, token=sender_token, headers=headers)
-                data2 = tr2.json()
+                fresh, etag = _get_if_changed(sender_thread_url, etag, token=sender_token, headers=headers)
+                if fresh is not None:
+                    data2 = fresh
                 flag = _get_by_path(data2, read_flag_path)
                 if bool(flag):
                     found = True
                     break
             except Exception:
                 pass
-            time.sleep(0.5)
+            time.sleep(next(waits))
 
         dt = time.perf_counter() - t0
         samples.append(dt if found else float("inf"))
@@ -292,21 +424,26 @@ def _broadcast_fanout(step: Dict[str, Any]) -> Dict[str, Any]:
     try:
         br = _post(broadcast_url, payload, token=sender_token, headers=headers)
         br.raise_for_status()
-        brobj = br.json()
+        brobj = _json(br)
         broadcast_id = _get_by_path(brobj, "broadcast_id") or brobj.get("id") or req_id
     except Exception as e:
         print(f"  - 방송 전송 실패: {e}")
         return {"pass": False, "reason": "send_failed", "stats": {}}
 
-    # 2) 상태 폴링
+    # 2) 상태 폴링 (broadcast_id는 고정 → URL은 루프 밖에서 한 번만 생성)
+    try:
+        surl = status_url_tpl.format(broadcast_id=broadcast_id)
+    except Exception as e:
+        print(f"  - status_url 템플릿 오류: {e}")
+        return {"pass": False, "reason": "bad_status_url", "stats": {}}
     t0 = time.perf_counter()
     delays = []
     last_rate = 0.0
+    waits = _poll_waits(step, poll_interval_s)
     while time.perf_counter() - t0 < timeout_s:
         try:
-            surl = status_url_tpl.format(broadcast_id=broadcast_id)
             sr = _get(surl, token=sender_token, headers=headers)
-            data = sr.json()
+            data = _json(sr)
             delivered = int(_get_by_path(data, "delivered") or 0)
             total = int(_get_by_path(data, "total") or recipients)
             rate = delivered / max(1, total)
@@ -316,7 +453,7 @@ def _broadcast_fanout(step: Dict[str, Any]) -> Dict[str, Any]:
                 break
         except Exception:
             pass
-        time.sleep(poll_interval_s)
+        time.sleep(next(waits))
 
     if not delays:
         print(f"  - 타임아웃(성공률 {last_rate*100:.1f}% 미달)")
@@ -341,18 +478,32 @@ def _cross_device_sync(step: Dict[str, Any]) -> Dict[str, Any]:
     key_path: str = step.get("key_path", "threads.0.last_message.read")
     threshold_s: float = float(step.get("threshold_s", 5.0))
 
-    t0 = time.perf_counter()
-    consistent = False
-    while time.perf_counter() - t0 < threshold_s:
-        try:
-            w = _get(web_state_url, token=token, headers=headers).json()
-            m = _get(mobile_state_url, token=token, headers=headers).json()
-            if _get_by_path(w, key_path) == _get_by_path(m, key_path):
-                consistent = True
-                break
-        except Exception:
-            pass
-        time.sleep(0.5)
+    h = _headers(token, headers)
+
+    async def runner() -> bool:
+        async with _async_client() as client:
+            waits = _poll_waits(step, 0.5)
+            t0 = time.perf_counter()
+            while time.perf_counter() - t0 < threshold_s:
+                try:
+                    # 웹/모바일 상태를 동시에 조회 → 틱당 왕복 1회
+                    wr, mr = await asyncio.gather(
+                        client.get(web_state_url, headers=h),
+                        client.get(mobile_state_url, headers=h),
+                    )
+                    # 두 응답의 strong ETag가 같으면 바이트 단위로 같은 본문 → 파싱 없이 일치로 판단
+                    # (weak ETag(W/...)는 "의미상 동등"일 뿐이라 key_path 값을 직접 비교)
+                    w_tag = wr.headers.get("ETag")
+                    if w_tag and not w_tag.startswith("W/") and w_tag == mr.headers.get("ETag"):
+                        return True
+                    if _get_by_path(_json(wr), key_path) == _get_by_path(_json(mr), key_path):
+                        return True
+                except Exception:
+                    pass
+                await asyncio.sleep(next(waits))
+        return False
+
+    consistent = _run_async(runner)
 
     print(f"\n[INTERACTION > 교차기기 동기화]  {'PASS' if consistent else 'FAIL'}")
     return {"pass": consistent, "reason": "state_consistent" if consistent else "timeout_mismatch"}
@@ -376,27 +527,38 @@ def _dedup_guard(step: Dict[str, Any]) -> Dict[str, Any]:
     expect_max: int = int(step.get("expect_max_per_user", 1))
 
     idem = str(uuid.uuid4())
+    idem_bytes = idem.encode()
+
+    h = _headers(token, headers)
+    payload = dict(event_payload)
+    payload[idempotency_key_path] = idem
+
+    async def runner() -> int:
+        async with _async_client() as client:
+            # 동일 이벤트 트리거 N회 (동시 전송 → 경합 상황에서도 1회만 노출되는지 확인)
+            await asyncio.gather(
+                *(client.post(send_url, headers=h, json=payload) for _ in range(triggers)),
+                return_exceptions=True,
+            )
+
+            # 받은 알림에서 동일 key 개수 카운트
+            await asyncio.sleep(1.0)
+            try:
+                resp = await client.get(inbox_url, headers=h)
+                # 에러 응답 본문에는 idem이 없어 0으로 세어지므로 바이트 세기 전에 상태부터 확인
+                resp.raise_for_status()
+                raw = resp.content
+                # idem(UUID)은 항목마다 최소 1번 그대로 직렬화됨 → 바이트 등장 횟수가 실제 개수의 상한
+                # 상한이 기준 이하면 파싱 없이 통과, 넘을 때만 JSON 파싱으로 정확히 다시 셈
+                approx = raw.count(idem_bytes)
+                if approx <= expect_max:
+                    return approx
+                items = _get_by_path(_loads(raw), list_path) or []
+                return sum(1 for it in items if _get_by_path(it, key_path) == idem)
+            except Exception:
+                return triggers
 
-    # 동일 이벤트 트리거 N회
-    for _ in range(triggers):
-        payload = dict(event_payload)
-        payload[idempotency_key_path] = idem
-        try:
-            _post(send_url, payload, token=token, headers=headers)
-        except Exception:
-            pass
-
-    # 받은 알림에서 동일 key 개수 카운트
-    time.sleep(1.0)
-    try:
-        inbox = _get(inbox_url, token=token, headers=headers).json()
-        items = _get_by_path(inbox, list_path) or []
-        count = 0
-        for it in items:
-            if _get_by_path(it, key_path) == idem:
-                count += 1
-    except Exception:
-        count = triggers
+    count = _run_async(runner)
 
     ok = count <= expect_max
     print(f"\n[INTERACTION > 중복/폭주 알림 제어]  count={count}  expect≤{expect_max} → {'PASS' if ok else 'FAIL'}")
@@ -406,6 +568,15 @@ def _dedup_guard(step: Dict[str, Any]) -> Dict[str, Any]:
 # ------------------------------------------------------------
 # 6) 실시간 채팅 왕복 지연 (WebSocket)  평균 ≤ 0.5s, p95 ≤ 1.0s
 # ------------------------------------------------------------
+# ping:<uid> 같은 작은 프레임은 permessage-deflate 비용이 이득보다 큼 → 압축/keepalive ping 끔
+_WS_CONNECT_OPTS = {
+    "compression": None,
+    "ping_interval": None,
+    "ping_timeout": None,
+    "max_size": 2 ** 20,
+    "max_queue": None,
+}
+
 def _realtime_chat_latency_ws(step: Dict[str, Any]) -> Dict[str, Any]:
     if websockets is None:
         print("[INTERACTION > 실시간채팅] websockets 미설치 → SKIP")
@@ -417,17 +588,16 @@ def _realtime_chat_latency_ws(step: Dict[str, Any]) -> Dict[str, Any]:
     b_token = auth.get("b_token")
     headers = step.get("headers")
     messages: int = int(step.get("messages", 10))
+    timeout_s: float = float(step.get("timeout_s", 10.0))
     thresholds = step.get("thresholds", {"avg": 0.5, "p95": 1.0})
 
-    import asyncio
-
     async def runner():
         samples: List[float] = []
         # 토큰을 쿼리스트링으로 전달(서비스 구조에 맞게 수정 가능)
         at = f"&token={a_token}" if a_token else ""
         bt = f"&token={b_token}" if b_token else ""
-        async with websockets.connect(f"{ws_url}{at}") as A, \
-                   websockets.connect(f"{ws_url}{bt}") as B:
+        async with websockets.connect(f"{ws_url}{at}", **_WS_CONNECT_OPTS) as A, \
+                   websockets.connect(f"{ws_url}{bt}", **_WS_CONNECT_OPTS) as B:
             # B는 에코 서버처럼 동작: pong 전송
             async def b_loop():
                 while True:
@@ -438,29 +608,53 @@ def _realtime_chat_latency_ws(step: Dict[str, Any]) -> Dict[str, Any]:
                         uid = msg.split(":", 1)[1]
                         await B.send(f"pong:{uid}")
 
+            # A 수신 루프: pong을 uid로 매칭해 해당 ping의 future 완료
+            t0s: Dict[str, float] = {}
+            pending: Dict[str, asyncio.Future] = {}
+
+            async def a_loop():
+                while True:
+                    msg = await A.recv()
+                    if isinstance(msg, bytes):
+                        msg = msg.decode()
+                    if msg.startswith("pong:"):
+                        uid = msg.split(":", 1)[1]
+                        fut = pending.pop(uid, None)
+                        if fut is not None and not fut.done():
+                            fut.set_result(time.perf_counter() - t0s[uid])
+
             task_b = asyncio.create_task(b_loop())
+            task_a = asyncio.create_task(a_loop())
 
             try:
+                # ping을 pong 기다리지 않고 연달아 전송(파이프라이닝) → 수신 루프가 도착 순서대로 완료 처리
+                loop = asyncio.get_running_loop()
+                # 워밍업 ping 1회(표본 제외): 첫 프레임의 연결/버퍼 초기화 비용이 측정에 섞이지 않게
+                warm_uid = f"warmup-{uuid.uuid4()}"
+                warm = pending[warm_uid] = loop.create_future()
+                t0s[warm_uid] = time.perf_counter()
+                await A.send(f"ping:{warm_uid}")
+                await asyncio.wait([warm], timeout=timeout_s)
+                pending.pop(warm_uid, None)
+
+                futs: List[asyncio.Future] = []
                 for _ in range(messages):
                     uid = str(uuid.uuid4())
-                    t0 = time.perf_counter()
+                    fut = loop.create_future()
+                    pending[uid] = fut
+                    futs.append(fut)
+                    t0s[uid] = time.perf_counter()
                     await A.send(f"ping:{uid}")
-                    # pong 기다림
-                    while True:
-                        msg = await A.recv()
-                        if isinstance(msg, bytes):
-                            msg = msg.decode()
-                        if msg == f"pong:{uid}":
-                            samples.append(time.perf_counter() - t0)
-                            break
+                if futs:
+                    await asyncio.wait(futs, timeout=timeout_s)
+                # 유실된 pong은 inf로 기록
+                samples = [f.result() if f.done() else float("inf") for f in futs]
             finally:
+                task_a.cancel()
                 task_b.cancel()
         return samples
 
-    try:
-        samples = asyncio.get_event_loop().run_until_complete(runner())
-    except RuntimeError:
-        samples = asyncio.new_event_loop().run_until_complete(runner())
+    samples = _run_async(runner)
 
     stats = summarize(samples)
     ok = stats["avg"] <= thresholds.get("avg", 0.5) and stats["p95"] <= thresholds.get("p95", 1.0)
@@ -477,6 +671,20 @@ def _require_playwright(driver):
         raise RuntimeError("Playwright driver가 필요합니다.")
     return driver.page
 
+# 선택자별 {total, missing, error}: 대체텍스트 없는 IMG, 공백뿐인 aria-label을 missing으로 집계
+_A11Y_COUNT_JS = """
+sels => sels.map(s => {
+  let nodes;
+  try { nodes = document.querySelectorAll(s); } catch (e) { return {total: 0, missing: 0, error: String(e)}; }
+  let missing = 0;
+  nodes.forEach(el => {
+    if (el.tagName === 'IMG' && !el.alt) missing++;
+    if (el.hasAttribute('aria-label') && !el.getAttribute('aria-label').trim()) missing++;
+  });
+  return {total: nodes.length, missing};
+})
+"""
+
 def _accessibility_labels(step: Dict[str, Any], driver) -> Dict[str, Any]:
     page = _require_playwright(driver)
     targets: List[Dict[str, Any]] = step.get("targets", [])
@@ -486,14 +694,14 @@ def _accessibility_labels(step: Dict[str, Any], driver) -> Dict[str, Any]:
     for t in targets:
         url = t["url"]
         selectors: List[str] = t.get("selectors", ["[aria-label]", "img[alt]"])
-        page.goto(url)
-        page.wait_for_timeout(300)
-        misses = []
-        for sel in selectors:
-            try:
-                _ = page.locator(sel).count()
-            except Exception:
-                misses.append(sel)
+        page.goto(url, wait_until="domcontentloaded")
+        # 선택자별 검사를 브라우저 안에서 한 번에 수행 (선택자 수만큼 왕복하지 않음)
+        counts = page.evaluate(_A11Y_COUNT_JS, selectors)
+        misses = [
+            {"selector": sel, **c}
+            for sel, c in zip(selectors, counts)
+            if c.get("error") or c.get("missing", 0) > 0
+        ]
         results.append({"url": url, "misses": misses})
         print(f"  - {url}  misses={len(misses)}")
 
@@ -503,6 +711,7 @@ def _accessibility_labels(step: Dict[str, Any], driver) -> Dict[str, Any]:
 def _privacy_scope_check_ui(step: Dict[str, Any], driver) -> Dict[str, Any]:
     page = _require_playwright(driver)
     flows: List[Dict[str, Any]] = step.get("flows", [])
+    visible_timeout_ms: float = float(step.get("visible_timeout_ms", 1000))
 
     print("\n[INTERACTION > 읽음 공개 범위 UI]")
     all_ok = True
@@ -510,14 +719,26 @@ def _privacy_scope_check_ui(step: Dict[str, Any], driver) -> Dict[str, Any]:
     for f in flows:
         url = f["url"]
         checks: List[Dict[str, Any]] = f.get("checks", [])
-        page.goto(url)
-        page.wait_for_timeout(300)
+        page.goto(url, wait_until="domcontentloaded")
         ok = True
+        loaded = False
         for c in checks:
             sel = c["selector"]
             should_visible = bool(c.get("visible", True))
             try:
-                visible = page.is_visible(sel)
+                if should_visible:
+                    # 고정 300ms 대기 대신: 보여야 하는 요소는 나타나는 즉시 통과, 없을 때만 최대 visible_timeout_ms 대기
+                    page.locator(sel).first.wait_for(state="visible", timeout=visible_timeout_ms)
+                    visible = True
+                else:
+                    # 숨겨야 하는 요소는 URL당 한 번만 load까지 기다린 뒤 즉시 판단 (늦게 렌더링되는 요소 대비)
+                    if not loaded:
+                        loaded = True
+                        try:
+                            page.wait_for_load_state("load", timeout=visible_timeout_ms)
+                        except Exception:
+                            pass
+                    visible = page.locator(sel).first.is_visible()
             except Exception:
                 visible = False
             if visible != should_visible:
@@ -18,17 +18,35 @@
 from __future__ import annotations
 from typing import Dict, Any, List, Optional, Tuple
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
 import math
 import re
 import statistics
 from datetime import datetime, timedelta
+from src.core.deferred_print import defer_result, run_deferred
 from colorama import Fore, Style, init
 
-# (선택) scikit-learn이 있으면 IsolationForest 사용
+# (선택) numpy가 있으면 대량 레코드 검사를 벡터 연산으로 처리
 try:
-    from sklearn.ensemble import IsolationForest
-except Exception:
-    IsolationForest = None
+    import numpy as np
+except ImportError:
+    np = None
+
+# (선택) scikit-learn이 있으면 IsolationForest 사용
+# - import 비용이 커서(scipy/joblib 포함) use_ai일 때만 처음 한 번 로딩, 결과는 _SKLEARN에 캐시
+_SKLEARN: Dict[str, Any] = {}
+
+
+def _isolation_forest():
+    if "IsolationForest" not in _SKLEARN:
+        try:
+            from sklearn.ensemble import IsolationForest
+        except Exception:
+            IsolationForest = None
+        _SKLEARN["IsolationForest"] = IsolationForest
+    return _SKLEARN["IsolationForest"]
 
 
 # ---------------------------------------------------------------------
@@ -50,12 +68,28 @@ def check(driver, step: Dict[str, Any]) -> Dict[str, Any]:
         return completion_rule_check(step)
 
     elif assessment_type == "run_all":
-        results = [
-            history_presence(step),
-            progress_completeness(step),
-            activity_log_adequacy(step),
-            completion_rule_check(step),
-        ]
+        # 로그 그룹핑/타임스탬프 파싱은 한 번만 하고 하위 검사들이 공유
+        step = _normalize_logs(step)
+        # fail_fast: 앞 검사가 fail이면 나머지는 의미가 없으므로 건너뜀(기본 off)
+        fail_fast = bool(step.get("fail_fast", False))
+        checks = (history_presence, progress_completeness,
+                  activity_log_adequacy, completion_rule_check)
+        results = []
+        if step.get("parallel", True) and not fail_fast:
+            # 네 검사는 서로 독립 → 스레드 풀에서 동시에 실행, 결과/출력은 원래 순서대로
+            with ThreadPoolExecutor(max_workers=len(checks)) as ex:
+                futs = [ex.submit(run_deferred, fn, step) for fn in checks]
+                for fut in futs:
+                    r, printed = fut.result()
+                    for res in printed:
+                        print_step_result(res)
+                    results.append(r)
+        else:
+            for fn in checks:
+                r = fn(step)
+                results.append(r)
+                if fail_fast and r["status"] == "fail":
+                    break
 
         final = "pass"
         if any(r["status"] == "fail" for r in results):
@@ -100,6 +134,8 @@ def color_status(status: str) -> str:
 
 def print_step_result(res: Dict[str, Any]) -> None:
     """각 함수 내부에서 즉시 호출되는 단일 스텝 요약 + 짧은 설명."""
+    if defer_result(res):  # 병렬 run_all의 워커 스레드면 모아뒀다가 메인 스레드에서 출력
+        return
     name = res.get("name", "(unknown)")
     status = (res.get("status", "pass") or "pass").upper()
 
@@ -174,6 +210,34 @@ def brief_explain(res: Dict[str, Any]) -> str:
     return ""
 
 
+_DT_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y/%m/%d %H:%M:%S", "%Y/%m/%dT%H:%M:%S")
+# _DT_FORMATS 네 가지 모양을 정규식 하나로 판별: (날짜 구분자, 날짜/시간 구분자) 조합으로 허용 여부 결정
+_DT_RE = re.compile(
+    r"(\d{4})([-/])(\d{1,2})\2(\d{1,2})(?:([ T])(\d{1,2}):(\d{1,2}):(\d{1,2}))?", re.ASCII)
+_DT_SHAPES = {("-", " "), ("-", None), ("/", " "), ("/", "T")}
+
+
+@lru_cache(maxsize=1 << 17)
+def _to_dt_str(x: str) -> Optional[datetime]:
+    # 로그 타임스탬프는 같은 문자열이 반복되는 경우가 많아 결과를 캐시
+    m = _DT_RE.fullmatch(x)  # '$'는 끝 개행 앞에서도 매치되므로 fullmatch로 전체 일치만 허용
+    if m:
+        y, dsep, mo, d, tsep, h, mi, sec = m.groups()
+        if (dsep, tsep) not in _DT_SHAPES:
+            return None
+        try:
+            return datetime(int(y), int(mo), int(d), int(h or 0), int(mi or 0), int(sec or 0))
+        except ValueError:
+            return None
+    # 정규식에 안 맞는 드문 입력(공백 패딩 등)만 strptime으로 확인
+    for fmt in _DT_FORMATS:
+        try:
+            return datetime.strptime(x, fmt)
+        except Exception:
+            continue
+    return None
+
+
 def to_dt(x) -> Optional[datetime]:
     if not x:
         return None
@@ -183,23 +247,59 @@ def to_dt(x) -> Optional[datetime]:
         except Exception:
             return None
     if isinstance(x, str):
-        for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y/%m/%d %H:%M:%S", "%Y/%m/%dT%H:%M:%S"):
-            try:
-                return datetime.strptime(x, fmt)
-            except Exception:
-                continue
+        return _to_dt_str(x)
     return None
 
 
+def _as_uid(v) -> str:
+    # 대부분 이미 문자열이므로 타입만 확인하고 str() 호출은 생략 (None → "None"은 기존 str()과 동일)
+    return v if type(v) is str else str(v)
+
+
 def group_by_user(logs: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     g = defaultdict(list)
+    as_uid = _as_uid
     for ev in logs:
-        uid = str(ev.get("user_id") or ev.get("uid") or "")
+        uid = as_uid(ev.get("user_id") or ev.get("uid") or "")
         if uid:
             g[uid].append(ev)
     return g
 
 
+def _event_dt(e: Dict[str, Any]) -> Optional[datetime]:
+    # _normalize_logs가 남긴 파싱 결과(_ts_dt)가 있으면 재사용
+    if "_ts_dt" in e:
+        return e["_ts_dt"]
+    return to_dt(e.get("ts") or e.get("timestamp"))
+
+
+def _user_timestamps(evs: List[Dict[str, Any]]) -> List[datetime]:
+    ts = []
+    for e in evs:
+        dt = _event_dt(e)
+        if dt:
+            ts.append(dt)
+    return ts
+
+
+def _normalize_logs(step: Dict[str, Any]) -> Dict[str, Any]:
+    """run_all용: 사용자별 그룹(_grouped)과 타임스탬프(_ts_by_user)를 미리 계산한 step 사본 반환
+    - 각 이벤트에는 파싱된 시각을 _ts_dt로 한 번만 기록(밑줄 필드: 내부 캐시용, 직렬화 대상 아님)"""
+    logs: List[Dict[str, Any]] = step.get("logs", []) or []
+    for e in logs:
+        e["_ts_dt"] = to_dt(e.get("ts") or e.get("timestamp"))
+    grouped = group_by_user(logs)
+    ts_by_user = {uid: _user_timestamps(evs) for uid, evs in grouped.items()}
+    return {**step, "_grouped": grouped, "_ts_by_user": ts_by_user}
+
+
+def _grouped_logs(step: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    g = step.get("_grouped")
+    if g is None:
+        g = group_by_user(step.get("logs", []) or [])
+    return g
+
+
 # ------------------------------------
 # 학습 데이터 관리: 학습 이력 저장 여부
 # ------------------------------------
@@ -209,9 +309,8 @@ def history_presence(step: Dict[str, Any]) -> Dict[str, Any]:
       - logs: [{user_id, event_type, ts, ...}, ...]
       - users: ["u1","u2",...] (선택)
     """
-    logs: List[Dict[str, Any]] = step.get("logs", []) or []
     users: List[str] = step.get("users", []) or []
-    g = group_by_user(logs)
+    g = _grouped_logs(step)
     target_users = users or list(g.keys())
     missing = [u for u in target_users if u not in g or len(g[u]) == 0]
     ok = len(target_users) - len(missing)
@@ -232,6 +331,46 @@ def history_presence(step: Dict[str, Any]) -> Dict[str, Any]:
 # ------------------------------------
 # 학습 데이터 관리: 학습 진도율 누락 감지
 # ------------------------------------
+def _progress_scan_py(records: List[Dict[str, Any]]) -> Tuple[int, List[str]]:
+    invalid = 0
+    by_u = defaultdict(list)
+    as_uid = _as_uid
+    for r in records:
+        p = r.get("progress", None)
+        by_u[as_uid(r.get("user_id"))].append(p)
+        if p is None or (not isinstance(p, (int, float))) or p < 0 or p > 100:
+            invalid += 1
+    zero_only = []
+    for uid, vals in by_u.items():
+        norm = [v for v in vals if isinstance(v, (int, float))]
+        if norm and all((v == 0 for v in norm)):
+            zero_only.append(uid)
+    return invalid, zero_only
+
+
+def _progress_scan_np(records: List[Dict[str, Any]]) -> Tuple[int, List[str]]:
+    """_progress_scan_py와 같은 판정을 배열 한 번 순회로 처리
+    (숫자 아님 → invalid, NaN은 기존처럼 범위검사 통과 + 0 아님으로 취급)"""
+    n = len(records)
+    raw = [r.get("progress", None) for r in records]
+    is_num = np.fromiter((isinstance(v, (int, float)) for v in raw), dtype=bool, count=n)
+    try:
+        prog = np.fromiter((v if ok else 0.0 for v, ok in zip(raw, is_num)), dtype=np.float64, count=n)
+    except OverflowError:  # float 범위를 넘는 정수 → 순수 파이썬 경로
+        return _progress_scan_py(records)
+    out_of_range = is_num & ((prog < 0) | (prog > 100))
+    invalid = int(n - is_num.sum() + out_of_range.sum())
+
+    # 사용자별 (숫자 개수, 0이 아닌 숫자 개수) → 숫자가 있고 전부 0이면 zero-only
+    as_uid = _as_uid
+    uids = np.array([as_uid(r.get("user_id")) for r in records])
+    codes, inv = np.unique(uids, return_inverse=True)
+    num_cnt = np.bincount(inv, weights=is_num, minlength=codes.size)
+    nz_cnt = np.bincount(inv, weights=is_num & (prog != 0), minlength=codes.size)
+    zero_only = codes[(num_cnt > 0) & (nz_cnt == 0)].tolist()
+    return invalid, zero_only
+
+
 def progress_completeness(step: Dict[str, Any]) -> Dict[str, Any]:
     """
     입력:
@@ -241,31 +380,22 @@ def progress_completeness(step: Dict[str, Any]) -> Dict[str, Any]:
     records: List[Dict[str, Any]] = step.get("progress", []) or []
     freshness_days: int = int(step.get("freshness_days", 0))
 
-    invalid = 0
-    zero_only_users = set()
     stale_users = set()
 
-    # 사용자별 모든 progress 값 수집
-    by_u = defaultdict(list)
-    for r in records:
-        uid = str(r.get("user_id"))
-        p = r.get("progress", None)
-        by_u[uid].append(p)
+    # 범위/결측 + 0%만 있는 사용자
+    if np is not None and records:
+        invalid, zero_only_users = _progress_scan_np(records)
+    else:
+        invalid, zero_only_users = _progress_scan_py(records)
 
-        # 신선도 체크
-        if freshness_days > 0:
+    # 신선도 체크
+    if freshness_days > 0:
+        now = datetime.now()
+        limit = timedelta(days=freshness_days)
+        for r in records:
             dt = to_dt(r.get("last_updated"))
-            if not dt or (datetime.now() - dt) > timedelta(days=freshness_days):
-                stale_users.add(uid)
-
-        # 범위/결측 체크
-        if p is None or (not isinstance(p, (int, float))) or p < 0 or p > 100:
-            invalid += 1
-
-    for uid, vals in by_u.items():
-        norm = [v for v in vals if isinstance(v, (int, float))]
-        if norm and all((v == 0 for v in norm)):
-            zero_only_users.add(uid)
+            if not dt or (now - dt) > limit:
+                stale_users.add(_as_uid(r.get("user_id")))
 
     status = "pass"
     issues = []
@@ -275,11 +405,11 @@ def progress_completeness(step: Dict[str, Any]) -> Dict[str, Any]:
     if zero_only_users:
         status = "warn"
         issues.append({"issue": "ZERO_ONLY_USERS", "count": len(
-            zero_only_users), "ids": list(zero_only_users)[:10]})
+            zero_only_users), "ids": zero_only_users[:10]})
     if freshness_days > 0 and stale_users:
         status = "warn"
         issues.append({"issue": "STALE_PROGRESS", "count": len(
-            stale_users), "ids": list(stale_users)[:10]})
+            stale_users), "ids": list(islice(stale_users, 10))})
 
     res = {
         "name": "학습 진도율 누락 감지",
@@ -298,63 +428,156 @@ def progress_completeness(step: Dict[str, Any]) -> Dict[str, Any]:
 REQUIRED_EVENTS_DEFAULT = ["start_course",
                            "progress", "submit_assignment", "take_exam"]
 
+# 간단한 동의어 매핑: 이벤트 유형(소문자) → 대표 이벤트
+_EVENT_ALIAS: Dict[str, str] = {
+    "start": "start_course", "start_course": "start_course", "course_start": "start_course",
+    "progress": "progress", "progress_inc": "progress", "learn_step": "progress",
+    "submit_assignment": "submit_assignment", "assignment_submit": "submit_assignment", "hw_submit": "submit_assignment",
+    "take_exam": "take_exam", "exam_start": "take_exam", "exam_submit": "take_exam",
+}
+
+
+# 이벤트 유형 문자열 종류는 적고 반복이 많으므로 lower()+별칭 조회 결과를 문자열별로 캐시
+@lru_cache(maxsize=1024)
+def _canon_event(raw: str) -> Optional[str]:
+    """대표 이벤트(별칭 아니면 None)"""
+    return _EVENT_ALIAS.get(raw.lower())
+
+
+@lru_cache(maxsize=1024)
+def _event_kind(raw: str) -> str:
+    """피처용 유형: 대표 이벤트, 별칭이 아니면 소문자 원래 이름"""
+    return _canon_event(raw) or raw.lower()
+
+
+# 필수 이벤트 → 비트. 사용자별 충족 여부를 dict 대신 정수 하나로 표시
+_BIT: Dict[str, int] = {"start_course": 1, "progress": 2, "submit_assignment": 4, "take_exam": 8}
+
 
-def _ensure_required_map(logs: List[Dict[str, Any]], required: List[str]) -> Dict[str, Dict[str, bool]]:
-    g = group_by_user(logs)
+def _required_bits(required: List[str]) -> Dict[str, int]:
+    if list(required) == REQUIRED_EVENTS_DEFAULT:
+        return _BIT
+    # 사용자 지정 목록이면 순서대로 비트 부여(중복 제거)
+    return {k: 1 << i for i, k in enumerate(dict.fromkeys(required))}
+
+
+def _ensure_required_map(logs: List[Dict[str, Any]], required: List[str],
+                         grouped: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> Dict[str, int]:
+    """uid → 충족한 필수 이벤트 비트마스크(_required_bits 기준)"""
+    g = grouped if grouped is not None else group_by_user(logs)
+    bits = _required_bits(required)
+    full = sum(bits.values())
+    canon = _canon_event
     out = {}
     for uid, evs in g.items():
-        seen = {k: False for k in required}
+        mask = 0
         for e in evs:
-            et = str(e.get("event_type") or e.get("type") or "").lower()
-            # 간단한 동의어 매핑
-            if et in ("start", "start_course", "course_start"):
-                seen["start_course"] = True
-            if et in ("progress", "progress_inc", "learn_step"):
-                seen["progress"] = True
-            if et in ("submit_assignment", "assignment_submit", "hw_submit"):
-                seen["submit_assignment"] = True
-            if et in ("take_exam", "exam_start", "exam_submit"):
-                seen["take_exam"] = True
-        out[uid] = seen
+            raw = e.get("event_type") or e.get("type") or ""
+            b = bits.get(canon(raw if type(raw) is str else str(raw)))
+            if b:
+                mask |= b
+                if mask == full:
+                    break
+        out[uid] = mask
     return out
 
 
-def build_user_features(logs: List[Dict[str, Any]]) -> Dict[str, List[float]]:
-    """사용자별 간단 피처(이벤트수, 유형수, progress 비율, 평균 간격(초))"""
-    g = group_by_user(logs)
-    feats = {}
-    for uid, evs in g.items():
-        total = len(evs)
-        types = set(str(e.get("event_type") or e.get("type") or "").lower()
-                    for e in evs)
-        progress_cnt = sum(1 for e in evs if str(
-            e.get("event_type") or "").lower().startswith("progress"))
-        # 시간 간격
-        ts = []
-        for e in evs:
-            dt = to_dt(e.get("ts") or e.get("timestamp"))
-            if dt:
-                ts.append(dt)
-        ts.sort()
-        gaps = [(ts[i] - ts[i-1]).total_seconds()
-                for i in range(1, len(ts))] if len(ts) >= 2 else [0.0]
-        avg_gap = sum(gaps)/len(gaps) if gaps else 0.0
-        feats[uid] = [float(total), float(len(types)),
-                      float(progress_cnt), float(avg_gap)]
-    return feats
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _avg_gap(ts: List[datetime]) -> float:
+    # 정렬된 시각의 인접 간격 평균 = (최대 - 최소) / (개수 - 1) → 정렬/간격 리스트 불필요
+    if len(ts) < 2:
+        return 0.0
+    return (max(ts) - min(ts)).total_seconds() / (len(ts) - 1)
+
+
+def _event_types(evs: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """(유형 수, progress 이벤트 수) — 둘 다 _EVENT_ALIAS로 정규화한 대표 이벤트 기준
+    (별칭이 아닌 유형은 원래 이름 그대로 한 종류로 셈)"""
+    kind = _event_kind
+    c = Counter(kind(raw if type(raw) is str else str(raw)) for raw in
+                (e.get("event_type") or e.get("type") or "" for e in evs))
+    return len(c), c.get("progress", 0)
+
+
+def _build_user_features_np(logs: List[Dict[str, Any]],
+                            grouped: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+    """SoA 경로: 사용자별 그룹을 이어 붙인 이벤트 배열 + 구간 경계(offsets)로 피처 행렬을 채움
+    이벤트수 = 구간 길이, 평균 간격 = 구간별 (max-min)/(유효 시각 수-1)을 reduceat으로 한 번에
+    (그룹핑은 run_all이 이미 만든 _grouped를 재사용, 없을 때만 group_by_user)"""
+    g = grouped if grouped is not None else group_by_user(logs)
+    uids = list(g.keys())
+    U = len(uids)
+    X = np.empty((U, 4), dtype=np.float64)
+    if U == 0:
+        return uids, X
+    offsets = np.zeros(U + 1, dtype=np.intp)
+    np.cumsum(np.fromiter((len(v) for v in g.values()), dtype=np.intp, count=U), out=offsets[1:])
+    starts = offsets[:-1]
+    X[:, 0] = np.diff(offsets)
+
+    evs_sorted = list(chain.from_iterable(g.values()))
+    for i, evs in enumerate(g.values()):
+        X[i, 1], X[i, 2] = _event_types(evs)
+
+    secs = np.fromiter(
+        ((dt - _EPOCH).total_seconds() if dt else np.nan
+         for dt in (_event_dt(e) for e in evs_sorted)),
+        dtype=np.float64, count=len(evs_sorted))
+    cnt = np.add.reduceat(~np.isnan(secs), starts)
+    span = np.fmax.reduceat(secs, starts) - np.fmin.reduceat(secs, starts)
+    X[:, 3] = np.where(cnt >= 2, span / np.maximum(cnt - 1, 1), 0.0)
+    return uids, X
+
+
+def build_user_features(logs: List[Dict[str, Any]],
+                        grouped: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                        ts_by_user: Optional[Dict[str, List[datetime]]] = None):
+    """사용자별 간단 피처(이벤트수, 유형수, progress 비율, 평균 간격(초))
+    반환: (uids, X) — X[i]가 uids[i]의 피처 4개.
+    numpy가 있으면 인덱스 구간(SoA) 경로로 (U, 4) float64 배열을 만들어 모델에 그대로 전달,
+    없으면 grouped/ts_by_user(사용자별 dict)로 행 리스트 생성"""
+    if np is not None:
+        return _build_user_features_np(logs, grouped)
+    g = grouped if grouped is not None else group_by_user(logs)
+    uids = list(g.keys())
+    X = [None] * len(uids)
+    # 루프 안 전역/속성 조회를 줄이기 위해 지역 변수로 고정
+    event_types, avg_gap = _event_types, _avg_gap
+    ts_of = ts_by_user.__getitem__ if ts_by_user is not None else None
+    for row, uid in enumerate(uids):
+        evs = g[uid]
+        ntypes, progress_cnt = event_types(evs)
+        # 시간 간격(_normalize_logs의 파싱 결과 재사용)
+        ts = ts_of(uid) if ts_of is not None else _user_timestamps(evs)
+        X[row] = (float(len(evs)), float(ntypes),
+                  float(progress_cnt), avg_gap(ts))
+    return uids, X
 
 
 def iqr_anomaly_flags(values: List[float]) -> List[bool]:
+    """IQR(1.5배) 밖이면 True. 값이 수천 개 이상이면 numpy 경로를 강력 권장(순수 파이썬 분위수는 느림)"""
     if len(values) < 4:
         return [False]*len(values)
-    q1 = statistics.quantiles(values, n=4)[0]
-    q3 = statistics.quantiles(values, n=4)[2]
+    if np is not None:
+        return _iqr_flags_np(np.asarray(values, dtype=np.float64)).tolist()
+    q1, _, q3 = statistics.quantiles(values, n=4)
     iqr = q3 - q1
     low = q1 - 1.5*iqr
     high = q3 + 1.5*iqr
     return [(v < low or v > high) for v in values]
 
 
+def _iqr_flags_np(values: np.ndarray) -> np.ndarray:
+    """iqr_anomaly_flags의 배열 버전. statistics.quantiles 기본(exclusive)과 같은 분위수 = numpy 'weibull'"""
+    if values.size < 4:
+        return np.zeros(values.size, dtype=bool)
+    q1, q3 = np.percentile(values, [25, 75], method="weibull")
+    iqr = q3 - q1
+    return (values < q1 - 1.5*iqr) | (values > q3 + 1.5*iqr)
+
+
 def activity_log_adequacy(step: Dict[str, Any]) -> Dict[str, Any]:
     """
     입력:
@@ -368,12 +591,14 @@ def activity_log_adequacy(step: Dict[str, Any]) -> Dict[str, Any]:
     use_ai: bool = bool(step.get("use_ai", False))
 
     # 필수 이벤트 커버리지
-    req_map = _ensure_required_map(logs, required)
+    grouped = _grouped_logs(step)
+    req_map = _ensure_required_map(logs, required, grouped)
+    bits = _required_bits(required)
+    full = sum(bits.values())
     missing_map = {}
-    for uid, seen in req_map.items():
-        missing = [k for k, v in seen.items() if not v]
-        if missing:
-            missing_map[uid] = missing
+    for uid, mask in req_map.items():
+        if mask != full:
+            missing_map[uid] = [k for k, b in bits.items() if not (mask & b)]
 
     status = "pass" if not missing_map else ("warn" if len(
         missing_map) <= max(1, len(req_map)//10) else "fail")
@@ -385,26 +610,29 @@ def activity_log_adequacy(step: Dict[str, Any]) -> Dict[str, Any]:
     # (선택) 이상치 탐지
     anomalies = []
     if use_ai and logs:
-        feats = build_user_features(logs)
-        X = list(feats.values())
-        uids = list(feats.keys())
+        uids, X = build_user_features(logs, grouped, step.get("_ts_by_user"))
+        IsolationForest = _isolation_forest()
         if IsolationForest is not None and len(X) >= 8:
             try:
                 model = IsolationForest(
                     n_estimators=100, contamination="auto", random_state=42)
-                preds = model.fit_predict(X)  # -1: outlier
-                anomalies = [uids[i] for i, p in enumerate(preds) if p == -1]
+                preds = model.fit_predict(X)  # -1: outlier, X는 연속 float64 배열 그대로 전달
+                anomalies = [uids[i] for i in np.nonzero(preds == -1)[0]]
             except Exception:
                 anomalies = []
         else:
             # 간단 IQR 폴백: 각 피처별 이상치가 2개 이상인 사용자만 outlier로 간주
-            cols = list(zip(*X)) if X else []
-            flags_per_col = [iqr_anomaly_flags(
-                list(col)) for col in cols] if cols else []
-            for i in range(len(uids)):
-                flag_count = sum(1 for col in flags_per_col if col and col[i])
-                if flag_count >= 2:
-                    anomalies.append(uids[i])
+            if np is not None:
+                flags = np.stack([_iqr_flags_np(X[:, c]) for c in range(X.shape[1])])
+                anomalies = [uids[i] for i in np.nonzero(flags.sum(axis=0) >= 2)[0]]
+            else:
+                cols = list(zip(*X)) if X else []
+                flags_per_col = [iqr_anomaly_flags(
+                    list(col)) for col in cols] if cols else []
+                for i in range(len(uids)):
+                    flag_count = sum(1 for col in flags_per_col if col and col[i])
+                    if flag_count >= 2:
+                        anomalies.append(uids[i])
 
         if anomalies:
             status = "warn" if status == "pass" else status
@@ -414,7 +642,7 @@ def activity_log_adequacy(step: Dict[str, Any]) -> Dict[str, Any]:
     res = {
         "name": "학습 활동 로그 적절성 평가",
         "status": status,
-        "missing_map": dict(list(missing_map.items())[:20]),
+        "missing_map": dict(islice(missing_map.items(), 20)),
         "anomaly_count": len(anomalies),
         "anomalies": anomalies[:20],
         "issues": issues
@@ -444,29 +672,53 @@ def completion_rule_check(step: Dict[str, Any]) -> Dict[str, Any]:
     req_exam = bool(rules.get("require_exam", True))
 
     # dict화
-    prog_map = {str(r.get("user_id")): float(r.get("progress", 0))
+    as_uid = _as_uid
+    prog_map = {as_uid(r.get("user_id")): float(r.get("progress", 0))
                 for r in progress}
-    asg_map = {str(r.get("user_id")): bool(r.get("submitted", False))
+    asg_map = {as_uid(r.get("user_id")): bool(r.get("submitted", False))
                for r in assignment}
-    exam_map = {str(r.get("user_id")): bool(r.get("taken", False))
+    exam_map = {as_uid(r.get("user_id")): bool(r.get("taken", False))
                 for r in exam}
 
-    users = set(list(prog_map.keys()) +
-                list(asg_map.keys()) + list(exam_map.keys()))
+    # dict_keys 합집합: 임시 리스트 없이 바로 set
+    users = prog_map.keys() | asg_map.keys() | exam_map.keys()
+    pg, ag, eg = prog_map.get, asg_map.get, exam_map.get
     fails = []
     ok = 0
-    for uid in users:
-        reasons = []
-        if prog_map.get(uid, 0.0) < min_progress:
-            reasons.append("progress")
-        if req_asg and not asg_map.get(uid, False):
-            reasons.append("assignment")
-        if req_exam and not exam_map.get(uid, False):
-            reasons.append("exam")
-        if reasons:
+    if np is not None and users:
+        # 규칙 판정은 bool 배열로 한 번에, 사유 문자열은 보고할 30명만 생성
+        all_users = sorted(users)
+        n = len(all_users)
+        prog_arr = np.fromiter((pg(u, 0.0) for u in all_users), dtype=np.float64, count=n)
+        fail_mask = prog_arr < min_progress
+        if req_asg:
+            fail_mask |= ~np.fromiter((ag(u, False) for u in all_users), dtype=bool, count=n)
+        if req_exam:
+            fail_mask |= ~np.fromiter((eg(u, False) for u in all_users), dtype=bool, count=n)
+        ok = n - int(fail_mask.sum())
+        for i in np.nonzero(fail_mask)[0][:30]:
+            uid = all_users[i]
+            reasons = []
+            if prog_arr[i] < min_progress:
+                reasons.append("progress")
+            if req_asg and not ag(uid, False):
+                reasons.append("assignment")
+            if req_exam and not eg(uid, False):
+                reasons.append("exam")
             fails.append({"user_id": uid, "reasons": reasons})
-        else:
-            ok += 1
+    else:
+        for uid in sorted(users):
+            reasons = []
+            if pg(uid, 0.0) < min_progress:
+                reasons.append("progress")
+            if req_asg and not ag(uid, False):
+                reasons.append("assignment")
+            if req_exam and not eg(uid, False):
+                reasons.append("exam")
+            if reasons:
+                fails.append({"user_id": uid, "reasons": reasons})
+            else:
+                ok += 1
 
     completion_rate = round(ok / max(1, len(users)), 3)
     status = "pass" if not fails else (
@@ -1,27 +1,164 @@
 # src/assessments/compatibility.py
 
-import time
+import os
+import queue
+import atexit
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.common.exceptions import WebDriverException, NoSuchElementException, ElementClickInterceptedException, NoAlertPresentException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException, NoSuchElementException, ElementClickInterceptedException, NoAlertPresentException, TimeoutException
 import random
 import json
 
-def check_browser_compatibility(driver: WebDriver, url: str, browser_name: str, test_feature: str):
+# ---------------------------------------------------------------------
+# Chrome 드라이버 풀: 기동(수 초)을 step마다 반복하지 않고 재사용
+# ---------------------------------------------------------------------
+MAX_DRIVERS = int(os.environ.get("EDU_COMPAT_MAX_DRIVERS", "4"))
+# EDU_COMPAT_HEADLESS=1 이면 창 없이(headless) 실행. 기본은 기존처럼 창을 띄움
+HEADLESS = os.environ.get("EDU_COMPAT_HEADLESS") == "1"
+
+_DRIVER_POOL: "queue.Queue[WebDriver]" = queue.Queue()
+_DRIVER_LOCK = threading.Lock()
+_ALL_DRIVERS = []
+
+# storage는 현재 origin 기준이라 about:blank로 이동하기 전에 비워야 함 (about:blank에서는 접근 불가)
+_JS_CLEAR_STORAGE = "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+
+
+def _new_driver() -> WebDriver:
+    if not HEADLESS:
+        return webdriver.Chrome()
+    opts = webdriver.ChromeOptions()
+    opts.add_argument("--headless=new")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--no-sandbox")
+    return webdriver.Chrome(options=opts)
+
+
+def _acquire_driver() -> WebDriver:
+    while True:
+        try:
+            return _DRIVER_POOL.get_nowait()
+        except queue.Empty:
+            pass
+        with _DRIVER_LOCK:
+            if len(_ALL_DRIVERS) < MAX_DRIVERS:
+                driver = _new_driver()
+                _ALL_DRIVERS.append(driver)
+                return driver
+        try:
+            return _DRIVER_POOL.get(timeout=1.0)
+        except queue.Empty:
+            # 그사이 죽은 드라이버가 폐기됐으면 새로 만들 수 있으므로 다시 확인
+            continue
+
+
+def _reset_driver(driver: WebDriver) -> bool:
+    """다음 step에 쿠키/storage/페이지가 넘어가지 않도록 정리. 세션이 죽었으면 False"""
+    try:
+        driver.current_url  # 세션 생존 확인 (브라우저/세션이 죽었으면 예외)
+        driver.execute_script(_JS_CLEAR_STORAGE)
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+    except Exception:
+        return False
+    return True
+
+
+def _discard_driver(driver: WebDriver) -> None:
+    with _DRIVER_LOCK:
+        if driver in _ALL_DRIVERS:
+            _ALL_DRIVERS.remove(driver)
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+@contextmanager
+def borrow_driver():
+    """풀에서 드라이버를 빌려주고 끝나면 반납(quit 하지 않음). 풀이 비어 있으면 MAX_DRIVERS까지 새로 생성.
+    반납 시 정리에 실패한(죽은) 드라이버는 풀에 넣지 않고 종료"""
+    driver = _acquire_driver()
+    try:
+        yield driver
+    finally:
+        if _reset_driver(driver):
+            _DRIVER_POOL.put(driver)
+        else:
+            _discard_driver(driver)
+
+
+DEFAULT_WAIT_TIMEOUT = 10
+
+
+def _wait_for(driver: WebDriver, by: str, selector: str, timeout: float):
+    # 고정 sleep 대신 요소가 생기는 즉시 진행. 끝내 없으면 TimeoutException
+    return WebDriverWait(driver, timeout).until(EC.presence_of_element_located((by, selector)))
+
+
+# 여러 요소 상태를 execute_script 한 번으로 확인 (요소마다 find/is_displayed 왕복하지 않음)
+# - 기준 요소가 아직 없으면 null → WebDriverWait가 다시 시도
+_JS_VISIBLE = ("const vis = e => !!e && e.getClientRects().length > 0 && "
+               "getComputedStyle(e).visibility !== 'hidden';")
+_JS_LOGIN_FORM = _JS_VISIBLE + """
+const u = document.getElementById('username');
+if (!u) return null;
+const p = document.getElementById('password');
+const b = document.querySelector('button.login-btn');
+return [!!p, !!b, vis(u), vis(p), !!b && !b.disabled];
+"""
+_JS_MAIN_HEADER = _JS_VISIBLE + """
+const h = document.querySelector('header.main-header');
+if (!h) return null;
+return [vis(h)];
+"""
+_JS_MOBILE_UI = _JS_VISIBLE + """
+const m = document.querySelector('.mobile-menu-btn');
+if (!m) return null;
+const h = document.querySelector('header');
+return [!!h, vis(h), vis(m)];
+"""
+
+
+def _wait_js(driver: WebDriver, script: str, timeout: float) -> list:
+    # 기준 요소가 생길 때까지 대기 + 상태 수집을 같은 스크립트로 처리
+    return WebDriverWait(driver, timeout).until(lambda d: d.execute_script(script))
+
+
+@atexit.register
+def close_drivers() -> None:
+    with _DRIVER_LOCK:
+        while _ALL_DRIVERS:
+            d = _ALL_DRIVERS.pop()
+            try:
+                d.quit()
+            except Exception:
+                pass
+        while not _DRIVER_POOL.empty():
+            _DRIVER_POOL.get_nowait()
+
+def check_browser_compatibility(driver: WebDriver, url: str, browser_name: str, test_feature: str,
+                                wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
     # 브라우저별 호환성을 검증하는 함수
     results = {"test_name": f"{browser_name} {test_feature} Test", "passed": False, "details": ""}
     
     try:
         driver.get(url)
-        time.sleep(5) 
 
         if test_feature == "login_form":
-            username_field = driver.find_element(By.ID, "username")
-            password_field = driver.find_element(By.ID, "password")
-            login_button = driver.find_element(By.CSS_SELECTOR, "button.login-btn")
+            has_pw, has_btn, user_vis, pw_vis, btn_enabled = _wait_js(driver, _JS_LOGIN_FORM, wait_timeout)
+            if not has_pw:
+                raise NoSuchElementException("Unable to locate element: #password")
+            if not has_btn:
+                raise NoSuchElementException("Unable to locate element: button.login-btn")
             
-            if username_field.is_displayed() and password_field.is_displayed() and login_button.is_enabled():
+            if user_vis and pw_vis and btn_enabled:
                 results["passed"] = True
                 results["details"] = f"Login form is correctly displayed and enabled on {browser_name}."
             else:
@@ -30,27 +167,29 @@ def check_browser_compatibility(driver: WebDriver, url: str, browser_name: str,
         else:
             results["details"] = f"Unsupported browser test feature: {test_feature}."
 
-    except (WebDriverException, NoSuchElementException) as e:
+    except (WebDriverException, NoSuchElementException, TimeoutException) as e:
         results["details"] = f"An error occurred while testing on {browser_name}: {e}"
     except Exception as e:
         results["details"] = f"An unexpected error occurred on {browser_name}: {e}"
-    finally:
-        if driver:
-            driver.quit()
 
     return results
 
-def check_os_compatibility(driver: WebDriver, url: str, os_name: str, test_feature: str):
+def check_os_compatibility(driver: WebDriver, url: str, os_name: str, test_feature: str,
+                           wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
     # os 호환성을 검증하는 함수 (기능/디자인 동일성)
     results = {"test_name": f"{os_name} {test_feature} Test", "passed": False, "details": ""}
     
     try:
         driver.get(url)
-        time.sleep(5)
 
         if test_feature == "video_playback":
-            video_player = driver.find_element(By.CSS_SELECTOR, "video.course-video")
-            is_playable = driver.execute_script("return arguments[0].readyState >= 3;", video_player)
+            video_player = _wait_for(driver, By.CSS_SELECTOR, "video.course-video", wait_timeout)
+            # 요소가 생긴 뒤 버퍼링(readyState >= 3)까지 기다림, 시간 내 안 되면 재생 실패로 판정
+            try:
+                is_playable = WebDriverWait(driver, wait_timeout).until(
+                    lambda d: d.execute_script("return arguments[0].readyState >= 3;", video_player))
+            except TimeoutException:
+                is_playable = False
 
             if is_playable:
                 results["passed"] = True
@@ -59,7 +198,7 @@ def check_os_compatibility(driver: WebDriver, url: str, os_name: str, test_featu
                 results["details"] = f"Video playback failed to start on {os_name}."
 
         elif test_feature == "file_upload":
-            upload_input = driver.find_element(By.ID, "file-upload-input")
+            upload_input = _wait_for(driver, By.ID, "file-upload-input", wait_timeout)
             if upload_input.is_enabled():
                 results["passed"] = True
                 results["details"] = f"File upload function is enabled on {os_name}."
@@ -67,8 +206,8 @@ def check_os_compatibility(driver: WebDriver, url: str, os_name: str, test_featu
                 results["details"] = f"File upload function is not enabled on {os_name}."
         
         elif test_feature == "ui_layout":
-            header = driver.find_element(By.CSS_SELECTOR, "header.main-header")
-            if header.is_displayed():
+            (header_vis,) = _wait_js(driver, _JS_MAIN_HEADER, wait_timeout)
+            if header_vis:
                 results["passed"] = True
                 results["details"] = f"Main header is visible and present on {os_name}."
             else:
@@ -78,23 +217,19 @@ def check_os_compatibility(driver: WebDriver, url: str, os_name: str, test_featu
         else:
             results["details"] = f"Unsupported OS test feature: {test_feature}."
 
-    except (WebDriverException, NoSuchElementException) as e:
+    except (WebDriverException, NoSuchElementException, TimeoutException) as e:
         results["details"] = f"An error occurred while testing on {os_name}: {e}"
     except Exception as e:
         results["details"] = f"An unexpected error occurred on {os_name}: {e}"
-    finally:
-        if driver:
-            driver.quit()
     return results
 
-def check_loading_anxiety(driver: WebDriver, url: str):
+def check_loading_anxiety(driver: WebDriver, url: str, wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
     # 느린 로딩 시 사용자 불안 최소화
     results = {"test_name": "로딩 불안 최소화 테스트", "passed": False, "details": []}
     try:
         driver.get(url)
-        time.sleep(2)
         
-        load_button = driver.find_element(By.CSS_SELECTOR, "button.load-content-btn")
+        load_button = _wait_for(driver, By.CSS_SELECTOR, "button.load-content-btn", wait_timeout)
         load_button.click()
         
         loading_indicator = driver.find_element(By.CSS_SELECTOR, ".loading-indicator, .loading-message")
@@ -115,7 +250,7 @@ def check_loading_anxiety(driver: WebDriver, url: str):
             results["details"].append("로딩 시 아무런 피드백이 없어 사용자가 불안해할 수 있습니다.")
             results["passed"] = False
             
-    except NoSuchElementException:
+    except (NoSuchElementException, TimeoutException):
         results["details"].append("로딩을 유발하는 버튼이나 로딩 요소를 찾을 수 없습니다.")
         results["passed"] = False
     except Exception as e:
@@ -123,14 +258,13 @@ def check_loading_anxiety(driver: WebDriver, url: str):
         results["passed"] = False
     return results
 
-def check_quiz_notification(driver: WebDriver, url: str):
+def check_quiz_notification(driver: WebDriver, url: str, wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
     # 강의 완료/퀴즈 결과 알림 명확성 검증
     results = {"test_name": "알림 명확성 테스트", "passed": False, "details": []}
     try:
         driver.get(url)
-        time.sleep(3)
         
-        notification_popup = driver.find_element(By.CSS_SELECTOR, ".quiz-result-popup, .notification-message")
+        notification_popup = _wait_for(driver, By.CSS_SELECTOR, ".quiz-result-popup, .notification-message", wait_timeout)
         if notification_popup.is_displayed():
             results["details"].append("퀴즈 결과 알림이 명확하게 표시됩니다.")
             if any(char.isdigit() for char in notification_popup.text):
@@ -143,7 +277,7 @@ def check_quiz_notification(driver: WebDriver, url: str):
             results["details"].append("퀴즈 결과 알림을 찾을 수 없습니다.")
             results["passed"] = False
             
-    except NoSuchElementException:
+    except (NoSuchElementException, TimeoutException):
         results["details"].append("퀴즈 결과 알림 요소를 찾을 수 없습니다.")
         results["passed"] = False
     except Exception as e:
@@ -151,13 +285,16 @@ def check_quiz_notification(driver: WebDriver, url: str):
         results["passed"] = False
     return results
 
-def check_wcag_contrast(driver: WebDriver, url: str):
+def check_wcag_contrast(driver: WebDriver, url: str, wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
     # 글씨 크기와 대비(WCAG) 기준 충족 검증
     results = {"test_name": "WCAG 대비 테스트", "passed": False, "details": []}
     try:
         driver.get(url)
-        time.sleep(3)
         
+        try:
+            _wait_for(driver, By.CSS_SELECTOR, ".font-size-control, .theme-switcher", wait_timeout)
+        except TimeoutException:
+            pass  # 없으면 아래에서 빈 목록 → 미충족
         font_size_controls = driver.find_elements(By.CSS_SELECTOR, ".font-size-control, .theme-switcher")
         if font_size_controls:
             results["details"].append("폰트 크기 및 테마(다크 모드) 조절 기능이 존재합니다.")
@@ -171,14 +308,13 @@ def check_wcag_contrast(driver: WebDriver, url: str):
         results["passed"] = False
     return results
 
-def check_subtitle_sync(driver: WebDriver, url: str):
+def check_subtitle_sync(driver: WebDriver, url: str, wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
     # 자막이 강의 오디오와 정확히 맞는지 검증
     results = {"test_name": "자막 동기화 테스트", "passed": False, "details": []}
     try:
         driver.get(url)
-        time.sleep(5)
         
-        subtitle_element = driver.find_element(By.CSS_SELECTOR, ".subtitle-display")
+        subtitle_element = _wait_for(driver, By.CSS_SELECTOR, ".subtitle-display", wait_timeout)
         if subtitle_element.is_displayed():
             results["details"].append("자막이 동영상 재생 시 화면에 정상적으로 표시됩니다.")
             results["details"].append("자막 타이밍이 동영상과 정확히 일치하는 것으로 가정합니다.")
@@ -187,7 +323,7 @@ def check_subtitle_sync(driver: WebDriver, url: str):
             results["details"].append("자막이 화면에 표시되지 않습니다.")
             results["passed"] = False
             
-    except NoSuchElementException:
+    except (NoSuchElementException, TimeoutException):
         results["details"].append("자막을 표시하는 요소를 찾을 수 없습니다.")
         results["passed"] = False
     except Exception as e:
@@ -195,26 +331,26 @@ def check_subtitle_sync(driver: WebDriver, url: str):
         results["passed"] = False
     return results
 
-def check_mobile_ui(driver: WebDriver, url: str):
+def check_mobile_ui(driver: WebDriver, url: str, wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
     # 모바일 환경에서 버튼/텍스트 겹침 검증 (반응형 디자인)
     results = {"test_name": "모바일 UI 테스트", "passed": False, "details": []}
     try:
         # 뷰포트 크기를 모바일로 변경하여 테스트
         driver.set_window_size(375, 812) # iPhone X 크기
         driver.get(url)
-        time.sleep(3)
         
-        header = driver.find_element(By.CSS_SELECTOR, "header")
-        menu_button = driver.find_element(By.CSS_SELECTOR, ".mobile-menu-btn")
+        has_header, header_vis, menu_vis = _wait_js(driver, _JS_MOBILE_UI, wait_timeout)
+        if not has_header:
+            raise NoSuchElementException("Unable to locate element: header")
         
-        if header.is_displayed() and menu_button.is_displayed():
+        if header_vis and menu_vis:
             results["details"].append("모바일 뷰포트에서 헤더와 모바일 메뉴 버튼이 올바르게 표시됩니다.")
             results["passed"] = True
         else:
             results["details"].append("모바일 뷰포트에서 UI 요소가 깨지거나 숨겨져 있습니다.")
             results["passed"] = False
             
-    except NoSuchElementException:
+    except (NoSuchElementException, TimeoutException):
         results["details"].append("필수 UI 요소를 찾을 수 없습니다. 모바일 UI에 문제가 있을 수 있습니다.")
         results["passed"] = False
     except Exception as e:
@@ -226,39 +362,61 @@ def check_mobile_ui(driver: WebDriver, url: str):
 
 def check(driver: WebDriver, step: dict):
     # 메인 함수: step의 'test_type'에 따라 알맞은 테스트 함수를 호출
+    # Selenium 드라이버가 넘어오면 그대로 쓰고, 아니면 풀에서 빌려 씀(종료는 풀이 관리)
+    if isinstance(driver, WebDriver):
+        return _dispatch(driver, step)
+    with borrow_driver() as driver_instance:
+        return _dispatch(driver_instance, step)
+
+
+def check_many(steps: list, driver=None, return_exceptions: bool = False) -> list:
+    # 여러 step을 드라이버 풀 크기만큼 병렬 실행 (결과는 입력 순서)
+    # Selenium 드라이버가 직접 넘어오면 스레드 간에 공유할 수 없으므로 그 드라이버로 순차 실행
+    # return_exceptions=True면 실패한 step 자리에 예외 객체를 넣어 반환
+    def _one(st):
+        try:
+            return check(driver, st)
+        except Exception as e:
+            if return_exceptions:
+                return e
+            raise
+
+    if isinstance(driver, WebDriver) or len(steps) <= 1:
+        return [_one(st) for st in steps]
+    with ThreadPoolExecutor(max_workers=min(MAX_DRIVERS, len(steps))) as ex:
+        return list(ex.map(_one, steps))
+
+
+def _dispatch(driver_instance: WebDriver, step: dict):
     test_type = step.get("test_type")
     url = step.get("url")
+    wait_timeout = float(step.get("wait_timeout", DEFAULT_WAIT_TIMEOUT))
 
-    # 모든 테스트 함수가 driver를 생성하고 닫도록 수정
-    driver_instance = webdriver.Chrome()
-
-    try:
-        if test_type == "browser_compatibility":
-            return check_browser_compatibility(
-                driver_instance, 
-                url, 
-                step.get("browser_name"), 
-                step.get("test_feature")
-            )
-        elif test_type == "os_compatibility":
-            return check_os_compatibility(
-                driver_instance, 
-                url, 
-                step.get("os_name"), 
-                step.get("test_feature")
-            )
-        elif test_type == "loading_anxiety":
-            return check_loading_anxiety(driver_instance, url)
-        elif test_type == "quiz_notification":
-            return check_quiz_notification(driver_instance, url)
-        elif test_type == "wcag_contrast":
-            return check_wcag_contrast(driver_instance, url)
-        elif test_type == "subtitle_sync":
-            return check_subtitle_sync(driver_instance, url)
-        elif test_type == "mobile_ui":
-            return check_mobile_ui(driver_instance, url)
-        else:
-            return {"test_name": "Compatibility Test", "passed": False, "details": f"Unknown test type: {test_type}"}
-    finally:
-        if driver_instance:
-            driver_instance.quit()
\ No newline at end of file
+    if test_type == "browser_compatibility":
+        return check_browser_compatibility(
+            driver_instance, 
+            url, 
+            step.get("browser_name"), 
+            step.get("test_feature"),
+            wait_timeout
+        )
+    elif test_type == "os_compatibility":
+        return check_os_compatibility(
+            driver_instance, 
+            url, 
+            step.get("os_name"), 
+            step.get("test_feature"),
+            wait_timeout
+        )
+    elif test_type == "loading_anxiety":
+        return check_loading_anxiety(driver_instance, url, wait_timeout)
+    elif test_type == "quiz_notification":
+        return check_quiz_notification(driver_instance, url, wait_timeout)
+    elif test_type == "wcag_contrast":
+        return check_wcag_contrast(driver_instance, url, wait_timeout)
+    elif test_type == "subtitle_sync":
+        return check_subtitle_sync(driver_instance, url, wait_timeout)
+    elif test_type == "mobile_ui":
+        return check_mobile_ui(driver_instance, url, wait_timeout)
+    else:
+        return {"test_name": "Compatibility Test", "passed": False, "details": f"Unknown test type: {test_type}"}
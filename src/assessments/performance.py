@@ -29,6 +29,12 @@ import statistics
 import math
 from colorama import Fore, Style
 
+# (선택) numpy가 있으면 summarize를 정렬 없이 벡터 연산으로 처리
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 # ---------------------------------------------------------------------
 # 엔트리 포인트: 실행효율성 검사 라우팅
@@ -72,9 +78,45 @@ def percentile(values: List[float], p: float) -> float:
     return xs[f] * (c - k) + xs[c] * (k - f)
 
 
+def _summarize_np(xs_all: List[float]) -> Optional[Dict[str, float]]:
+    """numpy 경로: 전체 정렬 대신 np.partition으로 필요한 순위만 배치 → O(n).
+    숫자가 아닌 값이 섞여 배열 변환이 안 되면 None (순수 파이썬 경로로)"""
+    arr = np.asarray(xs_all)
+    if arr.ndim != 1 or arr.dtype.kind not in "fiub":
+        return None
+    arr = arr.astype(np.float64, copy=False)
+    xs = arr[np.isfinite(arr)]
+    n = int(xs.size)
+    if n == 0:
+        return None
+    # percentile()과 같은 선형보간: k = (n-1) * p
+    k = np.array([0.50, 0.90, 0.95, 0.99]) * (n - 1)
+    f = np.floor(k).astype(np.intp)
+    c = np.minimum(f + 1, n - 1)
+    part = np.partition(xs, np.unique(np.concatenate((f, c, [0, n - 1]))))
+    lo, hi = part[f], part[c]
+    med, p90, p95, p99 = np.where(f == c, lo, lo * (c - k) + hi * (k - f)).tolist()
+    return {
+        "count": len(xs_all),
+        "finite_count": n,
+        "errors": len(xs_all) - n,
+        "avg": float(xs.mean()),
+        "median": med,
+        "p90": p90,
+        "p95": p95,
+        "p99": p99,
+        "min": float(part[0]),
+        "max": float(part[n - 1]),
+    }
+
+
 def summarize(samples: List[float]) -> Dict[str, float]:
     """샘플(초) 리스트에서 핵심 통계량 산출. 비유한값(inf/NaN)은 제외."""
     xs_all = list(samples)
+    if np is not None:
+        stats = _summarize_np(xs_all)
+        if stats is not None:
+            return stats
     xs = [x for x in xs_all if isinstance(
         x, (int, float)) and math.isfinite(x)]
     err_cnt = len(xs_all) - len(xs)
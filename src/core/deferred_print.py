@@ -0,0 +1,25 @@
+# src/core/deferred_print.py
+# 병렬 run_all 중에는 워커 스레드의 출력이 섞이지 않도록 결과를 모아뒀다가 메인 스레드에서 출력
+# - run_deferred(fn, step): 워커에서 fn(step) 실행, (결과, 모아둔 출력 대상 리스트) 반환
+# - defer_result(res): print_step_result 맨 앞에서 호출. 워커 스레드면 res를 모아두고 True
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+_PRINT_TLS = threading.local()
+
+
+def run_deferred(fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 step: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    _PRINT_TLS.deferred = []
+    try:
+        return fn(step), _PRINT_TLS.deferred
+    finally:
+        _PRINT_TLS.deferred = None
+
+
+def defer_result(res: Dict[str, Any]) -> bool:
+    deferred = getattr(_PRINT_TLS, "deferred", None)
+    if deferred is None:
+        return False
+    deferred.append(res)
+    return True
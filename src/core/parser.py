@@ -2,9 +2,18 @@
 import json
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def parse_routine(path):
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
         # yujin 디버딩용
         #print("✅ routine data type:", type(data))
         #print("✅ routine content:", data)
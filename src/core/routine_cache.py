@@ -0,0 +1,83 @@
+# src/core/routine_cache.py
+# 루틴 JSON 파싱 결과를 디스크에 보관하는 캐시
+# - 키: 파일 경로, 값: (mtime_ns, size, 파싱 결과를 pickle한 bytes)
+# - mtime/size가 그대로면 다음 실행에서도 파싱을 건너뜀
+# - 호출 측이 루틴/step dict에 파생 필드(_source, _ts_dt 등)를 붙이므로
+#   객체를 공유하지 않고 put 시점 스냅샷(bytes)을 보관, get마다 새 객체로 복원
+import os
+import pickle
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "EDU_ROUTINE_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "edutestsw", "routines.pkl"),
+)
+
+_MISS = object()
+
+
+class RoutineCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._entries: Dict[str, Tuple[int, int, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+            if isinstance(data, dict):
+                # 이전 형식(객체를 그대로 저장)의 항목은 버리고 다시 파싱
+                self._entries = {k: v for k, v in data.items()
+                                 if isinstance(v, tuple) and len(v) == 3 and isinstance(v[2], bytes)}
+        except Exception:
+            # 캐시가 없거나 깨졌으면 빈 캐시로 시작
+            self._entries = {}
+
+    def get(self, file_path: str, mtime_ns: int, size: int) -> Any:
+        """일치하는 항목이 없으면 MISS 반환. 매번 독립된 사본을 돌려줌"""
+        hit = self._entries.get(file_path)
+        if hit is None or hit[0] != mtime_ns or hit[1] != size:
+            return _MISS
+        return pickle.loads(hit[2])
+
+    def put(self, file_path: str, mtime_ns: int, size: int, data: Any) -> None:
+        blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[file_path] = (mtime_ns, size, blob)
+            self._dirty = True
+
+    def save(self) -> None:
+        """변경이 있을 때만 기록. 임시 파일에 쓴 뒤 교체하여 중간 실패 시에도 캐시 보존"""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(self._entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception as e:
+            print(f"[WARN] 루틴 캐시 저장 실패: {e}")
+
+
+def is_miss(value: Any) -> bool:
+    return value is _MISS
+
+
+_DEFAULT: Optional[RoutineCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_default_cache() -> RoutineCache:
+    """프로세스 내에서 하나의 캐시 인스턴스를 재사용"""
+    global _DEFAULT
+    if _DEFAULT is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT is None:
+                _DEFAULT = RoutineCache()
+    return _DEFAULT
@@ -19,13 +19,30 @@ assessments_map = {
 }
 
 
+def _run_compat_batch(batch: list, driver) -> None:
+    # 연속된 compatibility step은 드라이버 풀 크기만큼 병렬 실행 (step별 예외는 기존처럼 출력)
+    if not batch:
+        return
+    results = compatibility.check_many([st for _, st in batch], driver, return_exceptions=True)
+    for (idx, _), r in zip(batch, results):
+        if isinstance(r, Exception):
+            print(f"[ERROR] step {idx} 처리 중 예외 발생: {r}")
+    batch.clear()
+
+
 def run_routine(routine: dict, driver):
     steps = routine.get("steps", [])
     if not isinstance(steps, list):
         print("[ERROR] routine['steps']가 리스트가 아닙니다. JSON 구조를 확인하세요.")
         return
 
+    compat_batch = []
     for idx, step in enumerate(steps, start=1):
+        if isinstance(step, dict) and step.get("assessment") == "compatibility":
+            compat_batch.append((idx, step))
+            continue
+        _run_compat_batch(compat_batch, driver)
+
         if not isinstance(step, dict):
             print(f"[SKIP] 잘못된 step 형식 (index {idx}): {step!r}")
             continue
@@ -41,3 +58,4 @@ def run_routine(routine: dict, driver):
         except Exception as e:
 
             print(f"[ERROR] step {idx} 처리 중 예외 발생: {e}")
+    _run_compat_batch(compat_batch, driver)
@@ -0,0 +1,30 @@
+# src/core/server_common.py
+# 테스트용 FastAPI 서버(OSC_test_server, mock_lms_server)가 함께 쓰는 설정
+# - DefaultResponse: orjson이 있으면 ORJSONResponse, 없으면 JSONResponse
+# - uvicorn_options(): 설치된 경우에만 uvloop / httptools 사용
+from typing import Dict
+
+from fastapi.responses import JSONResponse
+
+# orjson이 있으면 응답 직렬화를 ORJSONResponse로 처리
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
+
+def uvicorn_options() -> Dict[str, str]:
+    """설치된 경우에만 uvloop / httptools 사용 (Windows 등에서는 기본값으로 대체)"""
+    opts = {"loop": "auto", "http": "auto"}
+    try:
+        import uvloop  # noqa: F401
+        opts["loop"] = "uvloop"
+    except ImportError:
+        pass
+    try:
+        import httptools  # noqa: F401
+        opts["http"] = "httptools"
+    except ImportError:
+        pass
+    return opts
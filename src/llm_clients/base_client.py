@@ -22,7 +22,7 @@ from transformers import StoppingCriteria, StoppingCriteriaList
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 SCRIPTS_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "../../scripts"))
 sys.path.append(SCRIPTS_DIR)
-from scripts.preload_model import get_tokenizer_model  # 싱글톤 반환
+from scripts.preload_model import get_tokenizer_model, inference  # 싱글톤 반환 / 추론 컨텍스트
 
 
 # ---------------------------------------------------------------------
@@ -179,7 +179,7 @@ def generate_json_with_timeout(
     def _worker():
         nonlocal out_ids
         try:
-            with torch.no_grad():
+            with inference():
                 out_ids = model.generate(
                     input_ids=inputs["input_ids"],
                     attention_mask=inputs["attention_mask"],